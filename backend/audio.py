@@ -0,0 +1,252 @@
+import hashlib
+import os
+import subprocess
+import time
+from typing import Any, Dict, List, Tuple
+import numpy as np
+import yt_dlp
+
+# Smallest stream that still carries audio; muxed formats are the last resort
+AUDIO_FORMAT = 'worstaudio[acodec!=none]/bestaudio/worst[acodec!=none]/best'
+# Containers the transcription API accepts as-is
+WHISPER_EXTENSIONS = {'flac', 'm4a', 'mp3', 'mp4', 'mpeg', 'mpga', 'oga', 'ogg', 'wav', 'webm'}
+
+
+def ffmpeg_exe() -> str:
+    """ffmpeg binary bundled with moviepy's imageio-ffmpeg, else the one on PATH"""
+    try:
+        import imageio_ffmpeg
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except Exception:
+        return 'ffmpeg'
+
+
+def run_ffmpeg(*args: str):
+    subprocess.run(
+        [ffmpeg_exe(), '-hide_banner', '-loglevel', 'error', '-y', *args],
+        check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+    )
+
+
+def audio_fingerprint(audio_path: str) -> str:
+    """Hash of the encoded audio packets, ignoring container metadata
+
+    Reposts usually carry byte-identical audio in a re-muxed container, so
+    hashing the stream rather than the file lets them share a transcript.
+    Falls back to hashing the whole file when ffmpeg can't read it.
+    """
+    try:
+        result = subprocess.run(
+            [ffmpeg_exe(), '-hide_banner', '-loglevel', 'error', '-i', audio_path,
+             '-map', '0:a:0', '-c', 'copy', '-f', 'hash', '-hash', 'sha256', '-'],
+            check=True, capture_output=True, text=True
+        )
+        digest = result.stdout.strip().split('=', 1)[-1]
+        if digest:
+            return digest
+    except (OSError, subprocess.CalledProcessError):
+        pass
+
+    sha = hashlib.sha256()
+    with open(audio_path, 'rb') as audio_file:
+        for block in iter(lambda: audio_file.read(1 << 20), b''):
+            sha.update(block)
+    return sha.hexdigest()
+
+
+def download_audio(url: str, temp_dir: str) -> Dict[str, Any]:
+    """Download only the audio of a post, remuxing without decoding when possible
+
+    Returns the audio path, bytes downloaded, seconds spent remuxing or
+    decoding, and the duration reported by yt-dlp.
+    """
+    ydl_opts = {
+        'format': AUDIO_FORMAT,
+        'outtmpl': os.path.join(temp_dir, 'source.%(ext)s'),
+        'quiet': True,
+        'retries': 5,
+        'fragment_retries': 5
+    }
+    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        info = ydl.extract_info(url, download=True)
+        source_path = ydl.prepare_filename(info)
+
+    if not os.path.exists(source_path):
+        raise FileNotFoundError("Audio download failed")
+
+    bytes_downloaded = os.path.getsize(source_path)
+    ext = (info.get('ext') or os.path.splitext(source_path)[1].lstrip('.')).lower()
+    has_video = info.get('vcodec') not in (None, 'none')
+    has_audio = info.get('acodec') != 'none'
+
+    started = time.monotonic()
+    audio_path = source_path
+    if has_audio and (has_video or ext not in WHISPER_EXTENSIONS):
+        # Drop the video track; copying the audio stream avoids a decode
+        audio_path = os.path.join(temp_dir, 'audio.m4a')
+        try:
+            run_ffmpeg('-i', source_path, '-vn', '-c:a', 'copy', audio_path)
+        except subprocess.CalledProcessError:
+            # Codec doesn't fit in an m4a container, so transcode instead
+            audio_path = os.path.join(temp_dir, 'audio.mp3')
+            run_ffmpeg('-i', source_path, '-vn', '-ac', '1', '-b:a', '64k', audio_path)
+
+    return {
+        'path': audio_path if has_audio else None,
+        'bytes_downloaded': bytes_downloaded,
+        'decode_seconds': time.monotonic() - started,
+        'duration': info.get('duration')
+    }
+
+
+def download_video_audio(url: str, temp_dir: str) -> Dict[str, Any]:
+    """Download the full video and decode its audio track to mp3 with moviepy"""
+    from moviepy.editor import VideoFileClip
+
+    video_path = os.path.join(temp_dir, 'video.mp4')
+    audio_path = os.path.join(temp_dir, 'audio.mp3')
+
+    ydl_opts = {
+        'format': 'best[ext=mp4]',
+        'outtmpl': video_path,
+        'quiet': True,
+        'retries': 5,
+        'fragment_retries': 5
+    }
+    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        ydl.download([url])
+
+    if not os.path.exists(video_path):
+        raise FileNotFoundError("Video download failed")
+
+    started = time.monotonic()
+    video = VideoFileClip(video_path)
+    try:
+        duration = video.duration
+        if video.audio is None:
+            audio_path = None
+        else:
+            video.audio.write_audiofile(audio_path, verbose=False, logger=None)
+    finally:
+        video.close()
+
+    return {
+        'path': audio_path,
+        'bytes_downloaded': os.path.getsize(video_path),
+        'decode_seconds': time.monotonic() - started,
+        'duration': duration
+    }
+
+
+# Speech preprocessing: Whisper works on 16 kHz mono internally
+SAMPLE_RATE = 16000
+FRAME_SECONDS = 0.02
+SILENCE_DBFS = -45.0
+MAX_PAUSE_SECONDS = 0.6
+PAD_SECONDS = 0.15
+CHUNK_SECONDS = float(os.environ.get('TRANSCRIBE_CHUNK_SECONDS', 120))
+
+
+def decode_pcm(audio_path: str) -> np.ndarray:
+    """Decode any audio file to 16 kHz mono float samples"""
+    result = subprocess.run(
+        [ffmpeg_exe(), '-hide_banner', '-loglevel', 'error', '-i', audio_path,
+         '-vn', '-ac', '1', '-ar', str(SAMPLE_RATE), '-f', 's16le', '-'],
+        check=True, capture_output=True
+    )
+    return np.frombuffer(result.stdout, dtype=np.int16).astype(np.float32) / 32768.0
+
+
+def speech_segments(samples: np.ndarray) -> List[Tuple[int, int]]:
+    """Sample ranges containing speech, with long pauses and edge silence cut out
+
+    Frames are classified by RMS energy against a threshold relative to the
+    loudest frames. Pauses shorter than MAX_PAUSE_SECONDS are kept so words
+    aren't run together, and every segment is padded slightly at both ends.
+    """
+    frame = int(SAMPLE_RATE * FRAME_SECONDS)
+    frame_count = len(samples) // frame
+    if frame_count == 0:
+        return []
+
+    frames = samples[:frame_count * frame].reshape(frame_count, frame)
+    rms = np.sqrt(np.mean(frames ** 2, axis=1))
+    threshold = max(10 ** (SILENCE_DBFS / 20), 0.05 * float(np.percentile(rms, 95)))
+    voiced = rms > threshold
+    if not voiced.any():
+        return []
+
+    # Edges of each voiced run, as frame indices
+    edges = np.diff(np.concatenate(([0], voiced.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+
+    max_pause = int(MAX_PAUSE_SECONDS / FRAME_SECONDS)
+    pad = int(PAD_SECONDS / FRAME_SECONDS)
+    segments: List[List[int]] = []
+    for start, end in zip(starts, ends):
+        if segments and start - segments[-1][1] <= max_pause:
+            segments[-1][1] = end
+        else:
+            segments.append([start, end])
+
+    return [
+        (max(0, start - pad) * frame, min(frame_count, end + pad) * frame)
+        for start, end in segments
+    ]
+
+
+def plan_chunks(segments: List[Tuple[int, int]], max_samples: int) -> List[List[Tuple[int, int]]]:
+    """Group speech segments into chunks no longer than max_samples, splitting at pauses"""
+    chunks: List[List[Tuple[int, int]]] = []
+    current: List[Tuple[int, int]] = []
+    current_len = 0
+    for start, end in segments:
+        # A single uninterrupted stretch longer than a chunk is split hard
+        while end - start > max_samples:
+            if current:
+                chunks.append(current)
+                current, current_len = [], 0
+            chunks.append([(start, start + max_samples)])
+            start += max_samples
+        if current and current_len + (end - start) > max_samples:
+            chunks.append(current)
+            current, current_len = [], 0
+        current.append((start, end))
+        current_len += end - start
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def prepare_speech_chunks(audio_path: str, out_dir: str) -> Dict[str, Any]:
+    """Downsample, strip silence and split audio into transcription-sized chunks
+
+    Each chunk is written as a small mono mp3. Returns the chunk paths in
+    playback order plus seconds of audio before and after trimming.
+    """
+    samples = decode_pcm(audio_path)
+    segments = speech_segments(samples)
+    chunks = plan_chunks(segments, int(CHUNK_SECONDS * SAMPLE_RATE))
+
+    paths = []
+    for index, chunk in enumerate(chunks):
+        pcm = np.concatenate([samples[start:end] for start, end in chunk])
+        chunk_path = os.path.join(out_dir, f'chunk_{index:03d}.mp3')
+        subprocess.run(
+            [ffmpeg_exe(), '-hide_banner', '-loglevel', 'error', '-y',
+             '-f', 's16le', '-ar', str(SAMPLE_RATE), '-ac', '1', '-i', '-',
+             '-b:a', '32k', chunk_path],
+            input=(pcm * 32767).astype(np.int16).tobytes(),
+            check=True, capture_output=True
+        )
+        paths.append(chunk_path)
+
+    original_seconds = len(samples) / SAMPLE_RATE
+    kept_seconds = sum(end - start for start, end in segments) / SAMPLE_RATE
+    return {
+        'chunks': paths,
+        'original_seconds': original_seconds,
+        'kept_seconds': kept_seconds,
+        'removed_seconds': original_seconds - kept_seconds
+    }
@@ -0,0 +1,98 @@
+import argparse
+import contextlib
+import json
+import os
+import sys
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, Iterator, List
+from cache import cache_key
+
+BATCH_WORKERS = int(os.environ.get('BATCH_WORKERS', 16))
+
+
+def dedupe_urls(urls: Iterable[str]) -> List[str]:
+    """Drop blanks and URLs that point at the same post, keeping first-seen order"""
+    seen = set()
+    unique = []
+    for url in urls:
+        url = url.strip()
+        if not url or url.startswith('#'):
+            continue
+        key = cache_key(url)
+        if key not in seen:
+            seen.add(key)
+            unique.append(url)
+    return unique
+
+
+def run_batch(urls: Iterable[str], extract: Callable[[str], Any],
+              workers: int = BATCH_WORKERS) -> Iterator[Dict[str, Any]]:
+    """Extract many URLs concurrently, yielding each result as it completes
+
+    Only ``workers * 2`` URLs are in flight at once so thousands of inputs
+    don't all sit in the executor queue. Per-stage limits inside the
+    pipeline decide how many downloads, browsers and model calls actually
+    run at the same time.
+    """
+    pending_urls = iter(dedupe_urls(urls))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='batch') as executor:
+        in_flight = {}
+
+        def fill():
+            while len(in_flight) < workers * 2:
+                url = next(pending_urls, None)
+                if url is None:
+                    return
+                in_flight[executor.submit(extract, url)] = url
+
+        fill()
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                url = in_flight.pop(future)
+                try:
+                    yield {'url': url, 'recipe': future.result().dict()}
+                except Exception as e:
+                    yield {'url': url, 'error': str(e)}
+            fill()
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Extract recipes for a list of Instagram URLs")
+    parser.add_argument('input', nargs='?', default='-',
+                        help="file with one URL per line, or - for stdin")
+    parser.add_argument('-o', '--output', default='-', help="NDJSON output file, or - for stdout")
+    parser.add_argument('-w', '--workers', type=int, default=BATCH_WORKERS,
+                        help="URLs processed at once")
+    args = parser.parse_args(argv)
+
+    import recipe_extractor
+
+    source = sys.stdin if args.input == '-' else open(args.input, encoding='utf-8')
+    with source:
+        urls = source.read().splitlines()
+
+    stdout = sys.stdout
+    sink = stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    succeeded = failed = 0
+    # The pipeline logs with print(); keep that off stdout so results stay pure NDJSON
+    with contextlib.redirect_stdout(sys.stderr):
+        try:
+            for result in run_batch(urls, recipe_extractor.extract_recipe_from_url, args.workers):
+                sink.write(json.dumps(result) + '\n')
+                sink.flush()
+                if 'error' in result:
+                    failed += 1
+                else:
+                    succeeded += 1
+        finally:
+            if sink is not stdout:
+                sink.close()
+            recipe_extractor.shutdown()
+
+    print(f"✅ {succeeded} recipes extracted, {failed} failed", file=sys.stderr)
+    return 0 if not failed else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
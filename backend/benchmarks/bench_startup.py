@@ -0,0 +1,64 @@
+"""Cold-start cost of the backend, measured in fresh interpreters
+
+Usage: python benchmarks/bench_startup.py [runs]
+
+Each scenario runs in its own subprocess so module caches don't carry over.
+"""
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCENARIOS = {
+    'import recipe_extractor': "import recipe_extractor",
+    'import server': "import server",
+    'first PDF': (
+        "import recipe_extractor\n"
+        "from benchmarks.sample_data import SAMPLE_RECIPE\n"
+        "recipe_extractor.export_recipe_pdf(recipe_extractor.Recipe(**SAMPLE_RECIPE))"
+    ),
+    # Everything the first /api/extract call imports before touching the network
+    'extract stack loaded': (
+        "import recipe_extractor\n"
+        "import fast_path, readiness, dom_extract, browser_pool, audio, openai, PIL.Image"
+    ),
+}
+
+TIMER = (
+    "import time, sys\n"
+    "started = time.perf_counter()\n"
+    "{code}\n"
+    "sys.stderr.write('ELAPSED %f\\n' % (time.perf_counter() - started))\n"
+)
+
+
+def measure(code: str, cwd: str) -> float:
+    env = dict(os.environ, PYTHONPATH=BACKEND_DIR, PYTHONDONTWRITEBYTECODE='0')
+    result = subprocess.run(
+        [sys.executable, '-c', TIMER.format(code=code)],
+        cwd=cwd, env=env, capture_output=True, text=True
+    )
+    for line in result.stderr.splitlines():
+        if line.startswith('ELAPSED '):
+            return float(line.split()[1])
+    raise RuntimeError(result.stderr.strip() or 'scenario produced no timing')
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    with tempfile.TemporaryDirectory() as cwd:
+        print(f"{'scenario':<26}{'median ms':>12}{'min ms':>10}")
+        for name, code in SCENARIOS.items():
+            try:
+                timings = [measure(code, cwd) for _ in range(runs)]
+            except RuntimeError as e:
+                print(f"{name:<26}{'failed':>12}  {str(e).splitlines()[-1]}")
+                continue
+            print(f"{name:<26}{statistics.median(timings) * 1000:>12.1f}{min(timings) * 1000:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+"""Thumbnail renders per second, legacy render vs the render context at each quality tier
+
+Usage: python benchmarks/bench_thumbnail.py [seconds-per-case]
+
+The legacy case reproduces the original generate_thumbnail body: full-size
+decode with a LANCZOS resize, font paths probed on every call and the
+gradient drawn one rectangle per row.
+"""
+import os
+import sys
+import time
+from io import BytesIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image as PILImage, ImageDraw, ImageFont  # noqa: E402
+import recipe_extractor  # noqa: E402
+import thumbnail  # noqa: E402
+from benchmarks.sample_data import SAMPLE_RECIPE  # noqa: E402
+
+
+def source_jpeg(width: int = 2160, height: int = 2700) -> bytes:
+    """Large portrait photo stand-in"""
+    img = PILImage.linear_gradient('L').resize((width, height)).convert('RGB')
+    buffer = BytesIO()
+    img.save(buffer, 'JPEG', quality=90)
+    return buffer.getvalue()
+
+
+def legacy_render(recipe, image_data: bytes) -> PILImage.Image:
+    target_width, target_height = 1280, 720
+    img = PILImage.open(BytesIO(image_data))
+    ratio = min(target_width / img.width, target_height / img.height)
+    new_size = (int(img.width * ratio), int(img.height * ratio))
+    img = img.resize(new_size, PILImage.LANCZOS)
+    background = PILImage.new('RGB', (target_width, target_height), (255, 255, 255))
+    background.paste(img, ((target_width - new_size[0]) // 2, (target_height - new_size[1]) // 2))
+    img = background
+    overlay = PILImage.new('RGBA', (target_width, target_height), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(overlay)
+    gradient_height = target_height // 3
+    for i in range(gradient_height):
+        alpha = int(255 * (i / gradient_height))
+        y_position = target_height - gradient_height + i
+        draw.rectangle([(0, y_position), (target_width, y_position + 1)], fill=(0, 0, 0, alpha))
+
+    fonts = {}
+    for size in (48, 32):
+        for path in thumbnail.FONT_PATHS:
+            try:
+                fonts[size] = ImageFont.truetype(path, size)
+                break
+            except OSError:
+                continue
+        fonts.setdefault(size, ImageFont.load_default())
+
+    title_y = target_height - 140
+    words, lines, current_line = recipe.title.split(), [], []
+    for word in words:
+        current_line.append(word)
+        bbox = fonts[48].getbbox(' '.join(current_line))
+        if bbox[2] - bbox[0] > target_width - 80:
+            if len(current_line) > 1:
+                current_line.pop()
+                lines.append(' '.join(current_line))
+                current_line = [word]
+            else:
+                lines.append(' '.join(current_line))
+                current_line = []
+    if current_line:
+        lines.append(' '.join(current_line))
+    for line in lines:
+        draw.text((42, title_y + 2), line, font=fonts[48], fill='black')
+        draw.text((40, title_y), line, font=fonts[48], fill='white')
+        title_y += 50
+
+    text = thumbnail.macro_line(recipe)
+    draw.text((42, target_height - 58), text, font=fonts[32], fill='black')
+    draw.text((40, target_height - 60), text, font=fonts[32], fill='white')
+    return PILImage.alpha_composite(img.convert('RGBA'), overlay).convert('RGB')
+
+
+def renders_per_second(render, recipe, image_data: bytes, seconds: float) -> float:
+    render(recipe, image_data)  # warm caches and imports
+    count = 0
+    started = time.perf_counter()
+    while time.perf_counter() - started < seconds:
+        render(recipe, image_data)
+        count += 1
+    return count / (time.perf_counter() - started)
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 3.0
+    recipe = recipe_extractor.Recipe(**SAMPLE_RECIPE)
+    image_data = source_jpeg()
+    before = renders_per_second(legacy_render, recipe, image_data, seconds)
+    print(f"{'legacy render':<16}{before:7.1f} renders/s")
+    for quality in thumbnail.QUALITY_TIERS:
+        render = lambda r, data: thumbnail.render_thumbnail(r, data, quality=quality)
+        after = renders_per_second(render, recipe, image_data, seconds)
+        _, stats = render(recipe, image_data)
+        print(f"{quality:<16}{after:7.1f} renders/s  ({after / before:.2f}x), "
+              f"decoded {stats['decoded_bytes'] / 1e6:.1f} of {stats['full_decode_bytes'] / 1e6:.1f} MB, "
+              f"~{stats['estimated_pixel_bytes'] / 1e6:.1f} MB of pixel buffers (estimated)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""Representative recipe payload shared by the benchmark scripts"""
+
+SAMPLE_RECIPE = {
+    'title': 'Creamy Garlic Parmesan Chicken Pasta with Sun-Dried Tomatoes',
+    'description': 'A weeknight one-pan pasta with a silky garlic parmesan sauce.',
+    'cuisine_type': 'Italian',
+    'difficulty': 'Easy',
+    'servings': 4,
+    'prep_time': 10,
+    'cook_time': 20,
+    'total_time': 30,
+    'ingredients': [
+        {'name': 'penne pasta', 'amount': 12, 'unit': 'oz', 'notes': None, 'category': 'grains',
+         'macro_contribution': None, 'shopping_info': None},
+        {'name': 'chicken breast', 'amount': 1.5, 'unit': 'lb', 'notes': 'cubed', 'category': 'protein',
+         'macro_contribution': None, 'shopping_info': None},
+        {'name': 'garlic', 'amount': 4, 'unit': 'cloves', 'notes': 'minced', 'category': 'produce',
+         'macro_contribution': None, 'shopping_info': None},
+        {'name': 'heavy cream', 'amount': 1, 'unit': 'cup', 'notes': None, 'category': 'dairy',
+         'macro_contribution': None, 'shopping_info': None},
+        {'name': 'parmesan cheese', 'amount': 0.75, 'unit': 'cup', 'notes': 'grated', 'category': 'dairy',
+         'macro_contribution': None, 'shopping_info': None},
+        {'name': 'olive oil', 'amount': 2, 'unit': 'tbsp', 'notes': None, 'category': 'pantry',
+         'macro_contribution': None, 'shopping_info': None},
+        {'name': 'sun-dried tomatoes', 'amount': 0.5, 'unit': 'cup', 'notes': 'chopped', 'category': 'pantry',
+         'macro_contribution': None, 'shopping_info': None},
+        {'name': 'salt', 'amount': 1, 'unit': 'tsp', 'notes': None, 'category': 'spices',
+         'macro_contribution': None, 'shopping_info': None},
+    ],
+    'steps': [
+        {'order': 1, 'instruction': 'Boil the pasta in salted water until al dente.', 'duration_minutes': 10,
+         'temperature': None, 'tips': 'Reserve a cup of pasta water.', 'equipment_needed': ['large pot']},
+        {'order': 2, 'instruction': 'Sear the chicken in olive oil until golden.', 'duration_minutes': 8,
+         'temperature': 'medium-high', 'tips': None, 'equipment_needed': ['skillet']},
+        {'order': 3, 'instruction': 'Add garlic, cream, parmesan and tomatoes; toss with pasta.',
+         'duration_minutes': 5, 'temperature': None, 'tips': None, 'equipment_needed': ['skillet']},
+    ],
+    'macros': {
+        'calories': 640, 'protein_g': 42.0, 'carbs_g': 58.0, 'fat_g': 26.0, 'fiber_g': 3.0,
+        'sugar_g': 4.0, 'saturated_fat_g': 13.0, 'protein_percentage': 26.0,
+        'carbs_percentage': 36.0, 'fat_percentage': 38.0,
+    },
+    'equipment_needed': ['large pot', 'skillet'],
+    'tags': ['pasta', 'chicken', 'weeknight'],
+    'tips_and_tricks': ['Use freshly grated parmesan so the sauce stays smooth.'],
+    'storage_instructions': 'Refrigerate in an airtight container for up to 3 days.',
+    'reheating_instructions': 'Warm gently with a splash of milk.',
+    'variations': ['Swap chicken for shrimp.'],
+    'calories_per_serving': 640,
+    'cost_estimate': 14.5,
+    'shopping_list': [
+        {'name': 'penne pasta', 'amount': 12, 'unit': 'oz', 'category': 'grains', 'store_section': 'Pasta & Grains'},
+        {'name': 'chicken breast', 'amount': 1.5, 'unit': 'lb', 'category': 'protein', 'store_section': 'Meat'},
+        {'name': 'heavy cream', 'amount': 1, 'unit': 'cup', 'category': 'dairy', 'store_section': 'Dairy'},
+    ],
+    'source_url': 'https://www.instagram.com/p/EXAMPLE/',
+    'video_transcription': None,
+    'thumbnail_url': None,
+    'created_at': '2024-03-01T12:00:00',
+}
@@ -0,0 +1,173 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.options import Options
+
+
+def build_chrome_options() -> Options:
+    """Headless Chrome options shared by every pooled browser"""
+    chrome_options = Options()
+    chrome_options.add_argument('--headless')
+    chrome_options.add_argument('--no-sandbox')
+    chrome_options.add_argument('--disable-dev-shm-usage')
+    chrome_options.add_argument('--disable-gpu')
+    chrome_options.add_argument('--window-size=1920x1080')
+    return chrome_options
+
+
+class BrowserPool:
+    """Bounded pool of warm headless Chrome instances
+
+    Browsers are checked out for the duration of one page scrape and handed
+    back afterwards. A browser is health-checked on checkout, recycled after
+    ``max_pages`` scrapes and replaced if it crashes while checked out.
+    """
+
+    def __init__(self, size: Optional[int] = None, max_pages: Optional[int] = None,
+                 checkout_timeout: Optional[float] = None,
+                 factory: Optional[Callable[[], webdriver.Chrome]] = None):
+        self.size = size or int(os.environ.get('BROWSER_POOL_SIZE', min(4, os.cpu_count() or 1)))
+        self.max_pages = max_pages or int(os.environ.get('BROWSER_POOL_MAX_PAGES', 50))
+        self.checkout_timeout = checkout_timeout or float(os.environ.get('BROWSER_POOL_TIMEOUT', 60))
+        self._factory = factory or (lambda: webdriver.Chrome(options=build_chrome_options()))
+        self._idle: List[webdriver.Chrome] = []
+        self._lock = threading.Lock()
+        # Signalled whenever a browser is returned or a slot frees up
+        self._available = threading.Condition(self._lock)
+        self._pages: Dict[int, int] = {}
+        self._created = 0
+        self._closed = False
+        self._counters = {'checkouts': 0, 'created': 0, 'recycled': 0, 'replaced': 0}
+
+    def warm(self, count: Optional[int] = None) -> int:
+        """Start browsers up front so the first requests don't pay Chrome startup"""
+        started = 0
+        for _ in range(min(count or self.size, self.size)):
+            driver = self._try_create()
+            if driver is None:
+                break
+            with self._available:
+                self._idle.append(driver)
+                self._available.notify()
+            started += 1
+        return started
+
+    def _try_create(self) -> Optional[webdriver.Chrome]:
+        """Launch a new browser if the pool is below its size limit"""
+        with self._lock:
+            if self._closed or self._created >= self.size:
+                return None
+            self._created += 1
+        return self._create_reserved()
+
+    def _create_reserved(self) -> webdriver.Chrome:
+        """Launch a browser into a slot already counted in ``_created``"""
+        try:
+            driver = self._factory()
+        except Exception:
+            with self._available:
+                self._created -= 1
+                self._available.notify()
+            raise
+        with self._lock:
+            self._pages[id(driver)] = 0
+            self._counters['created'] += 1
+        return driver
+
+    def _discard(self, driver: webdriver.Chrome):
+        """Quit a browser and free its slot in the pool, waking a waiter to refill it"""
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        with self._available:
+            self._pages.pop(id(driver), None)
+            self._created -= 1
+            self._available.notify()
+
+    @staticmethod
+    def _is_healthy(driver: webdriver.Chrome) -> bool:
+        """Cheap liveness probe: the session must still answer and own a window"""
+        try:
+            return bool(driver.window_handles)
+        except Exception:
+            return False
+
+    def _acquire(self, timeout: float) -> webdriver.Chrome:
+        deadline = time.monotonic() + timeout
+        while True:
+            driver = None
+            with self._available:
+                while True:
+                    if self._closed:
+                        raise RuntimeError("Browser pool is shut down")
+                    if self._idle:
+                        driver = self._idle.pop()
+                        break
+                    if self._created < self.size:
+                        # Reserve the slot; the browser is launched outside the lock
+                        self._created += 1
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError(f"No browser available after {timeout:.0f}s")
+                    self._available.wait(remaining)
+            if driver is None:
+                return self._create_reserved()
+            if self._is_healthy(driver):
+                return driver
+            self._discard(driver)
+            with self._lock:
+                self._counters['replaced'] += 1
+
+    def _release(self, driver: webdriver.Chrome, broken: bool):
+        with self._lock:
+            pages = self._pages.get(id(driver), 0) + 1
+            self._pages[id(driver)] = pages
+            closed = self._closed
+        if broken or closed or pages >= self.max_pages:
+            self._discard(driver)
+            with self._lock:
+                self._counters['replaced' if broken else 'recycled'] += 1
+            return
+        with self._available:
+            self._idle.append(driver)
+            self._available.notify()
+
+    @contextmanager
+    def checkout(self, timeout: Optional[float] = None):
+        """Borrow a browser for one scrape, returning it to the pool afterwards"""
+        driver = self._acquire(timeout or self.checkout_timeout)
+        with self._lock:
+            self._counters['checkouts'] += 1
+        broken = False
+        try:
+            yield driver
+        except WebDriverException:
+            broken = not self._is_healthy(driver)
+            raise
+        finally:
+            self._release(driver, broken)
+
+    def stats(self) -> Dict[str, int]:
+        """Snapshot of pool occupancy and lifetime counters"""
+        with self._lock:
+            return {
+                'size': self.size,
+                'live': self._created,
+                'idle': len(self._idle),
+                **self._counters,
+            }
+
+    def shutdown(self):
+        """Quit every idle browser; checked-out ones are quit when returned"""
+        with self._available:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._available.notify_all()
+        for driver in idle:
+            self._discard(driver)
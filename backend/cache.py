@@ -0,0 +1,275 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+CACHE_DIR = os.environ.get('CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache'))
+DEFAULT_TTL = float(os.environ.get('RESULT_CACHE_TTL', 7 * 24 * 3600))
+
+
+def cache_key(url: str) -> str:
+    """Normalize a post URL so share links and tracking params map to one key"""
+    parts = urlsplit(url.strip())
+    path = parts.path if parts.path.endswith('/') else parts.path + '/'
+    return urlunsplit((parts.scheme.lower() or 'https', parts.netloc.lower(), path, '', ''))
+
+
+class TTLCache:
+    """In-process LRU cache whose entries expire after ``ttl`` seconds"""
+
+    def __init__(self, max_entries: int = 256, ttl: float = DEFAULT_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Any, tuple]" = OrderedDict()
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get((namespace, key))
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.time():
+                del self._entries[(namespace, key)]
+                return None
+            self._entries.move_to_end((namespace, key))
+            return value
+
+    def set(self, namespace: str, key: str, value: Any):
+        with self._lock:
+            self._entries[(namespace, key)] = (time.time() + self.ttl, value)
+            self._entries.move_to_end((namespace, key))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteStore:
+    """JSON values on disk so results survive restarts"""
+
+    def __init__(self, path: str, ttl: float = DEFAULT_TTL):
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            " namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL,"
+            " expires_at REAL NOT NULL, PRIMARY KEY (namespace, key))"
+        )
+        self._conn.commit()
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM cache WHERE namespace = ? AND key = ?",
+                (namespace, key)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] < time.time():
+                self._conn.execute("DELETE FROM cache WHERE namespace = ? AND key = ?", (namespace, key))
+                self._conn.commit()
+                return None
+        return json.loads(row[0])
+
+    def set(self, namespace: str, key: str, value: Any):
+        payload = json.dumps(value)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                (namespace, key, payload, time.time() + self.ttl)
+            )
+            self._conn.commit()
+
+
+class SupabaseRecipeStore:
+    """Finished recipes read from and written to the Supabase ``recipes`` table
+
+    Only the ``recipe`` namespace is backed by the table; intermediate stages
+    are left to the local layers.
+    """
+
+    NAMESPACE = 'recipe'
+
+    def __init__(self, url: str, key: str, timeout: float = 5):
+        import requests
+
+        self.endpoint = f"{url.rstrip('/')}/rest/v1/recipes"
+        self.timeout = timeout
+        self._session = requests.Session()
+        self._session.headers.update({
+            'apikey': key,
+            'Authorization': f"Bearer {key}",
+            'Content-Type': 'application/json',
+        })
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        if namespace != self.NAMESPACE:
+            return None
+        import requests
+
+        try:
+            response = self._session.get(
+                self.endpoint,
+                params={'source_url': f"eq.{key}", 'select': '*', 'limit': 1},
+                timeout=self.timeout
+            )
+            response.raise_for_status()
+            rows = response.json()
+        except (requests.RequestException, ValueError) as e:
+            print(f"⚠️ Supabase cache lookup failed: {str(e)}")
+            return None
+        return rows[0] if rows else None
+
+    def set(self, namespace: str, key: str, value: Any):
+        if namespace != self.NAMESPACE:
+            return
+        # created_at is owned by the table default
+        row = {k: v for k, v in value.items() if k != 'created_at'}
+        row['source_url'] = key
+        import requests
+
+        try:
+            response = self._session.post(
+                self.endpoint,
+                json=row,
+                headers={'Prefer': 'resolution=ignore-duplicates,return=minimal'},
+                timeout=self.timeout
+            )
+            response.raise_for_status()
+        except requests.RequestException as e:
+            print(f"⚠️ Supabase cache write failed: {str(e)}")
+
+
+class TranscriptStore:
+    """Transcripts keyed by audio fingerprint and model, bounded by total size
+
+    Least recently used transcripts are evicted once the stored text exceeds
+    ``max_bytes``.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'misses': 0, 'evictions': 0}
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS transcripts ("
+            " fingerprint TEXT NOT NULL, model TEXT NOT NULL, text TEXT NOT NULL,"
+            " size INTEGER NOT NULL, last_used REAL NOT NULL,"
+            " PRIMARY KEY (fingerprint, model))"
+        )
+        self._conn.commit()
+
+    def get(self, fingerprint: str, model: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT text FROM transcripts WHERE fingerprint = ? AND model = ?",
+                (fingerprint, model)
+            ).fetchone()
+            if row is None:
+                self._counters['misses'] += 1
+                return None
+            self._conn.execute(
+                "UPDATE transcripts SET last_used = ? WHERE fingerprint = ? AND model = ?",
+                (time.time(), fingerprint, model)
+            )
+            self._conn.commit()
+            self._counters['hits'] += 1
+            return row[0]
+
+    def set(self, fingerprint: str, model: str, text: str):
+        size = len(text.encode('utf-8'))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO transcripts (fingerprint, model, text, size, last_used)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (fingerprint, model, text, size, time.time())
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM transcripts").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for fingerprint, model, size in self._conn.execute(
+                "SELECT fingerprint, model, size FROM transcripts ORDER BY last_used").fetchall():
+            if total <= self.max_bytes:
+                break
+            self._conn.execute(
+                "DELETE FROM transcripts WHERE fingerprint = ? AND model = ?", (fingerprint, model)
+            )
+            total -= size
+            self._counters['evictions'] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = dict(self._counters)
+            entries, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM transcripts").fetchone()
+        lookups = counters['hits'] + counters['misses']
+        return {
+            **counters,
+            'entries': entries,
+            'bytes': total,
+            'hit_rate': counters['hits'] / lookups if lookups else 0.0,
+        }
+
+
+class LayeredCache:
+    """Check each layer in order, back-filling faster layers on a hit"""
+
+    def __init__(self, layers: List[Any]):
+        self.layers = layers
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def _count(self, namespace: str, outcome: str):
+        with self._lock:
+            stats = self._stats.setdefault(namespace, {'hits': 0, 'misses': 0})
+            stats[outcome] += 1
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        for index, layer in enumerate(self.layers):
+            value = layer.get(namespace, key)
+            if value is not None:
+                for faster in self.layers[:index]:
+                    faster.set(namespace, key, value)
+                self._count(namespace, 'hits')
+                return value
+        self._count(namespace, 'misses')
+        return None
+
+    def set(self, namespace: str, key: str, value: Any):
+        for layer in self.layers:
+            layer.set(namespace, key, value)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {namespace: dict(counts) for namespace, counts in self._stats.items()}
+
+
+def build_result_cache() -> LayeredCache:
+    """Memory, then SQLite, then the recipes table when Supabase is configured"""
+    layers: List[Any] = [TTLCache(max_entries=int(os.environ.get('RESULT_CACHE_SIZE', 256)))]
+
+    db_path = os.environ.get('RESULT_CACHE_DB', os.path.join(CACHE_DIR, 'results.sqlite3'))
+    if db_path:
+        layers.append(SQLiteStore(db_path))
+
+    supabase_url = os.environ.get('SUPABASE_URL')
+    supabase_key = os.environ.get('SUPABASE_KEY')
+    if supabase_url and supabase_key:
+        layers.append(SupabaseRecipeStore(supabase_url, supabase_key))
+
+    return LayeredCache(layers)
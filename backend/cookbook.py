@@ -0,0 +1,236 @@
+import hashlib
+import math
+import zlib
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from fpdf import FPDF
+from pdf_export import add_recipe_pages, safe_text
+from shopping_list import ShoppingIndex, group_by_section
+from units import format_amount
+
+TOC_ENTRIES_PER_PAGE = 28
+TOC_LINE_HEIGHT = 8
+
+
+class StreamingPDF(FPDF):
+    """FPDF that writes each finished page out instead of holding the document
+
+    Page objects are emitted as soon as the next page starts, and images the
+    first time they are placed, so ``drain()`` can hand finished bytes to the
+    caller while later pages are still being laid out. Images are shared by
+    content hash across the whole document. Internal links may only point at
+    pages that were already written; pages can be listed out of write order
+    with ``page_order`` so a table of contents built last still comes first.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.set_auto_page_break(auto=True, margin=15)
+        self.page_order: Optional[List[int]] = None
+        self._written = 0
+        self._page_objects: Dict[int, int] = {}
+        self._image_names: Dict[str, str] = {}
+        self._putheader()
+
+    def drain(self) -> bytes:
+        """Bytes written since the last call"""
+        data = self.buffer.encode('latin-1')
+        self._written += len(data)
+        self.buffer = ''
+        return data
+
+    def _newobj(self):
+        self.n += 1
+        self.offsets[self.n] = self._written + len(self.buffer)
+        self._out(str(self.n) + ' 0 obj')
+
+    def _write_object(self, write):
+        # Objects go to the document buffer, not the page being drawn
+        state, self.state = self.state, 1
+        try:
+            write()
+        finally:
+            self.state = state
+
+    def image(self, name, x=None, y=None, w=0, h=0, type='', link=''):
+        if name not in self.images:
+            with open(name, 'rb') as source:
+                digest = hashlib.sha256(source.read()).hexdigest()
+            name = self._image_names.setdefault(digest, name)
+        is_new = name not in self.images
+        super().image(name, x, y, w, h, type, link)
+        if is_new:
+            info = self.images[name]
+            self._write_object(lambda: self._putimage(info))
+            info.pop('data', None)
+            info.pop('smask', None)
+
+    def _beginpage(self, orientation):
+        if self.page:
+            self._write_object(lambda: self._put_page(self.page))
+        super()._beginpage(orientation)
+
+    def _put_page(self, n: int):
+        if n in self._page_objects:
+            return
+        self._newobj()
+        self._page_objects[n] = self.n
+        self._out('<</Type /Page')
+        self._out('/Parent 1 0 R')
+        if n in self.orientation_changes:
+            self._out('/MediaBox [0 0 %.2f %.2f]' % (self.fh_pt, self.fw_pt))
+        self._out('/Resources 2 0 R')
+        if n in self.page_links:
+            annots = '/Annots ['
+            for x, y, w, h, link in self.page_links.pop(n):
+                rect = '%.2f %.2f %.2f %.2f' % (x, y, x + w, y - h)
+                annots += '<</Type /Annot /Subtype /Link /Rect [' + rect + '] /Border [0 0 0] '
+                if isinstance(link, str):
+                    annots += '/A <</S /URI /URI ' + self._textstring(link) + '>>>>'
+                else:
+                    page, link_y = self.links[link]
+                    h_pt = self.fw_pt if page in self.orientation_changes else self.fh_pt
+                    annots += '/Dest [%d 0 R /XYZ 0 %.2f null]>>' % (
+                        self._page_objects[page], h_pt - link_y * self.k)
+            self._out(annots + ']')
+        if self.pdf_version > '1.3':
+            self._out('/Group <</Type /Group /S /Transparency /CS /DeviceRGB>>')
+        self._out('/Contents ' + str(self.n + 1) + ' 0 R>>')
+        self._out('endobj')
+
+        content = self.pages[n].encode('latin-1')
+        self.pages[n] = ''
+        if self.compress:
+            content = zlib.compress(content)
+        self._newobj()
+        self._out('<<' + ('/Filter /FlateDecode ' if self.compress else '') +
+                  '/Length ' + str(len(content)) + '>>')
+        self._putstream(content)
+        self._out('endobj')
+
+    def _putpages(self):
+        if self.page:
+            self._put_page(self.page)
+        w_pt, h_pt = (self.fw_pt, self.fh_pt) if self.def_orientation == 'P' else (self.fh_pt, self.fw_pt)
+        order = self.page_order or range(1, self.page + 1)
+        self.offsets[1] = self._written + len(self.buffer)
+        self._out('1 0 obj')
+        self._out('<</Type /Pages')
+        self._out('/Kids [' + ''.join(f"{self._page_objects[n]} 0 R " for n in order) + ']')
+        self._out('/Count ' + str(self.page))
+        self._out('/MediaBox [0 0 %.2f %.2f]' % (w_pt, h_pt))
+        self._out('>>')
+        self._out('endobj')
+
+    def _putresources(self):
+        # Images were already written when first placed
+        self._putfonts()
+        self.offsets[2] = self._written + len(self.buffer)
+        self._out('2 0 obj')
+        self._out('<<')
+        self._putresourcedict()
+        self._out('>>')
+        self._out('endobj')
+
+    def _putcatalog(self):
+        self._out('/Type /Catalog')
+        self._out('/Pages 1 0 R')
+
+    def _enddoc(self):
+        # Same as FPDF._enddoc, with offsets counted from the start of the
+        # stream rather than the start of the buffer
+        self._putpages()
+        self._putresources()
+        self._newobj()
+        self._out('<<')
+        self._putinfo()
+        self._out('>>')
+        self._out('endobj')
+        self._newobj()
+        self._out('<<')
+        self._putcatalog()
+        self._out('>>')
+        self._out('endobj')
+
+        xref_offset = self._written + len(self.buffer)
+        self._out('xref')
+        self._out('0 ' + str(self.n + 1))
+        self._out('0000000000 65535 f ')
+        for i in range(1, self.n + 1):
+            self._out('%010d 00000 n ' % self.offsets[i])
+        self._out('trailer')
+        self._out('<<')
+        self._puttrailer()
+        self._out('>>')
+        self._out('startxref')
+        self._out(xref_offset)
+        self._out('%%EOF')
+        self.state = 3
+
+
+def _add_shopping_pages(pdf: FPDF, sections: Dict[str, List[Dict[str, Any]]]) -> int:
+    pdf.add_page()
+    first_page = pdf.page_no()
+    pdf.set_font('Arial', 'B', 18)
+    pdf.cell(0, 12, 'Shopping List', ln=True)
+    for section, items in sections.items():
+        pdf.set_font('Arial', 'B', 12)
+        pdf.cell(0, 10, safe_text(section), ln=True)
+        pdf.set_font('Arial', '', 12)
+        for item in items:
+            pdf.cell(0, 8, f"- {format_amount(item['amount'])} {safe_text(item['unit'])} {safe_text(item['name'])}",
+                     ln=True)
+        pdf.ln(2)
+    return first_page
+
+
+def _add_toc_pages(pdf: StreamingPDF, entries: List[Tuple[str, int]]) -> List[int]:
+    """Lay out the contents, returning the pages it used
+
+    The contents is written last but shown first, so listed page numbers are
+    shifted by the number of contents pages, which is fixed by the entry count.
+    """
+    toc_pages = max(1, math.ceil(len(entries) / TOC_ENTRIES_PER_PAGE))
+    pages = []
+    pdf.set_auto_page_break(False)
+    for index, (title, page) in enumerate(entries):
+        if index % TOC_ENTRIES_PER_PAGE == 0:
+            pdf.add_page()
+            pages.append(pdf.page_no())
+            if index == 0:
+                pdf.set_font('Arial', 'B', 24)
+                pdf.cell(0, 20, 'Contents', ln=True, align='C')
+            pdf.set_font('Arial', '', 12)
+        link = pdf.add_link()
+        pdf.set_link(link, page=page)
+        pdf.cell(170, TOC_LINE_HEIGHT, safe_text(title)[:80], link=link)
+        pdf.cell(0, TOC_LINE_HEIGHT, str(page + toc_pages), ln=True, align='R', link=link)
+    pdf.set_auto_page_break(True, margin=15)
+    return pages
+
+
+def render_cookbook(recipes: Iterable, thumbnail_for: Callable[[object], Optional[str]]) -> Iterator[bytes]:
+    """Stream one PDF holding every recipe, a merged shopping list and a contents page
+
+    Each recipe's pages are yielded as soon as they are laid out, so memory
+    stays flat however many recipes the cookbook holds. ``thumbnail_for``
+    returns the image file to embed for a recipe, if any.
+    """
+    pdf = StreamingPDF()
+    entries: List[Tuple[str, int]] = []
+    shopping = ShoppingIndex()
+    for recipe in recipes:
+        entries.append((recipe.title, add_recipe_pages(pdf, recipe, thumbnail_for(recipe))))
+        shopping.add_ingredients(recipe.ingredients)
+        chunk = pdf.drain()
+        if chunk:
+            yield chunk
+
+    sections = group_by_section(shopping.items())
+    if sections:
+        entries.append(('Shopping List', _add_shopping_pages(pdf, sections)))
+
+    content_pages = pdf.page_no()
+    toc_pages = _add_toc_pages(pdf, entries)
+    pdf.page_order = toc_pages + list(range(1, content_pages + 1))
+    pdf.close()
+    yield pdf.drain()
@@ -0,0 +1,94 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+# Fallback selectors for the post image, in priority order
+IMAGE_SELECTORS = [
+    "img[class*='x5yr21d']",
+    "img[class*='_aagt']",
+    "img[decoding='sync'][style*='width']",
+    "img[class*='_aa1d']",
+    "img[class*='_aagv']",
+]
+CDN_MARKERS = ('scontent', 'cdninstagram')
+MIN_IMAGE_SIDE = 200
+
+# Collects every candidate image and text source in a single round trip
+_EXTRACT_JS = """
+var selectors = arguments[0];
+var markers = arguments[1];
+var article = document.querySelector('article');
+var images = [];
+Array.from(document.images).forEach(function (img) {
+    var src = img.currentSrc || img.src || '';
+    if (!markers.some(function (marker) { return src.indexOf(marker) !== -1; })) {
+        return;
+    }
+    images.push({
+        src: src,
+        width: img.getAttribute('width'),
+        height: img.getAttribute('height'),
+        natural_width: img.naturalWidth,
+        natural_height: img.naturalHeight,
+        in_article: !!(article && article.contains(img)),
+        selectors: selectors.filter(function (selector) { return img.matches(selector); })
+    });
+});
+return {
+    images: images,
+    text: {
+        article: article ? article.innerText : null,
+        captions: Array.from(document.querySelectorAll('div._a9zs')).map(function (node) {
+            return node.innerText;
+        }),
+        body: document.body ? document.body.innerText : ''
+    }
+};
+"""
+
+
+def extract_dom_payload(driver) -> Dict[str, Any]:
+    """Pull candidate images and text sources from the page in one WebDriver call"""
+    return driver.execute_script(_EXTRACT_JS, IMAGE_SELECTORS, list(CDN_MARKERS)) or {}
+
+
+def _dimensions(image: Dict[str, Any]) -> tuple:
+    """Prefer the declared width/height attributes, falling back to the decoded size"""
+    try:
+        if image.get('width') and image.get('height'):
+            return int(image['width']), int(image['height'])
+    except (TypeError, ValueError):
+        pass
+    return int(image.get('natural_width') or 0), int(image.get('natural_height') or 0)
+
+
+def _qualifies(image: Dict[str, Any]) -> bool:
+    # Skip profile pictures which are usually small
+    width, height = _dimensions(image)
+    return width > MIN_IMAGE_SIDE and height > MIN_IMAGE_SIDE
+
+
+def select_image(payload: Dict[str, Any]) -> Optional[str]:
+    """Pick the post image: article images first, then each fallback selector in turn"""
+    images: List[Dict[str, Any]] = payload.get('images') or []
+
+    for image in images:
+        if image.get('in_article') and _qualifies(image):
+            return image['src']
+
+    for selector in IMAGE_SELECTORS:
+        for image in images:
+            if selector in (image.get('selectors') or []) and _qualifies(image):
+                return image['src']
+
+    return None
+
+
+def select_text(payload: Dict[str, Any]) -> Tuple[str, str]:
+    """Article text, else caption elements, else the whole body as a last resort,
+    with which of those it was"""
+    text = payload.get('text') or {}
+    if text.get('article') is not None:
+        return text['article'], 'article'
+    captions = [caption for caption in text.get('captions') or [] if caption]
+    if captions:
+        return "\n".join(captions), 'captions'
+    return text.get('body') or "", 'body'
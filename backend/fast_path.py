@@ -0,0 +1,155 @@
+import json
+import re
+import threading
+from typing import Any, Dict, Iterable, Optional
+import requests
+from bs4 import BeautifulSoup
+from dom_extract import CDN_MARKERS, MIN_IMAGE_SIDE
+from http_client import http_client
+
+FETCH_TIMEOUT = (5, 10)
+MAX_PAGE_BYTES = 5 * 1024 * 1024
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36"
+)
+PAGE_HEADERS = {
+    'User-Agent': USER_AGENT,
+    'Accept': 'text/html,application/xhtml+xml',
+    'Accept-Language': 'en-US,en;q=0.9',
+}
+
+_JSON_STRING = r'"((?:[^"\\]|\\.)*)"'
+_EMBEDDED_CAPTION_PATTERNS = [
+    re.compile(r'"edge_media_to_caption"\s*:\s*\{\s*"edges"\s*:\s*\[\s*\{\s*"node"\s*:\s*\{\s*"text"\s*:\s*' + _JSON_STRING),
+    re.compile(r'"caption"\s*:\s*\{[^{}]*?"text"\s*:\s*' + _JSON_STRING),
+]
+_EMBEDDED_IMAGE_PATTERN = re.compile(r'"display_url"\s*:\s*' + _JSON_STRING)
+# og:description looks like: 1,234 likes, 5 comments - user on March 3, 2024: "caption"
+_OG_CAPTION_PATTERN = re.compile(r'^.*?:\s*"(.*)"\.?\s*$', re.DOTALL)
+
+
+class TierCounters:
+    """Counts which extraction tier served each post"""
+
+    TIERS = ('fast_path', 'browser', 'failed')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {tier: 0 for tier in self.TIERS}
+
+    def record(self, tier: str):
+        with self._lock:
+            self._counts[tier] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = dict(self._counts)
+        total = sum(counts.values())
+        return {
+            **counts,
+            'total': total,
+            'fast_path_hit_rate': counts['fast_path'] / total if total else 0.0,
+        }
+
+
+tier_counters = TierCounters()
+
+
+def _decode_json_string(raw: str) -> Optional[str]:
+    try:
+        return json.loads(f'"{raw}"')
+    except ValueError:
+        return None
+
+
+def _first_match(patterns: Iterable[re.Pattern], html: str) -> Optional[str]:
+    for pattern in patterns:
+        match = pattern.search(html)
+        if match:
+            value = _decode_json_string(match.group(1))
+            if value and value.strip():
+                return value
+    return None
+
+
+def _meta(soup: BeautifulSoup, prop: str) -> Optional[str]:
+    tag = soup.find('meta', attrs={'property': prop}) or soup.find('meta', attrs={'name': prop})
+    return tag.get('content') if tag and tag.get('content') else None
+
+
+def _from_ld_json(soup: BeautifulSoup) -> Dict[str, Optional[str]]:
+    """Caption and image from schema.org JSON-LD blocks, when present"""
+    found = {'caption': None, 'image': None}
+    for script in soup.find_all('script', attrs={'type': 'application/ld+json'}):
+        try:
+            data = json.loads(script.string or '')
+        except ValueError:
+            continue
+        for item in data if isinstance(data, list) else [data]:
+            if not isinstance(item, dict):
+                continue
+            found['caption'] = found['caption'] or item.get('articleBody') or item.get('caption')
+            image = item.get('image')
+            if isinstance(image, list):
+                image = image[0] if image else None
+            if isinstance(image, dict):
+                image = image.get('url')
+            found['image'] = found['image'] or image
+    return found
+
+
+def _is_cdn_image(src: Optional[str]) -> bool:
+    return bool(src) and any(marker in src for marker in CDN_MARKERS)
+
+
+def parse_post_html(html: str, url: str) -> Dict[str, Any]:
+    """Pull the post image and caption out of embedded JSON and OpenGraph tags"""
+    soup = BeautifulSoup(html, 'html.parser')
+    ld = _from_ld_json(soup)
+
+    image_url = None
+    embedded_image = _first_match([_EMBEDDED_IMAGE_PATTERN], html)
+    for candidate in (embedded_image, ld['image'], _meta(soup, 'og:image')):
+        if _is_cdn_image(candidate):
+            image_url = candidate
+            break
+
+    # OpenGraph declares the image size; reject thumbnails the browser path would skip
+    width, height = _meta(soup, 'og:image:width'), _meta(soup, 'og:image:height')
+    if image_url and width and height and width.isdigit() and height.isdigit():
+        if int(width) <= MIN_IMAGE_SIDE or int(height) <= MIN_IMAGE_SIDE:
+            image_url = None
+
+    caption = _first_match(_EMBEDDED_CAPTION_PATTERNS, html) or ld['caption']
+    if not caption:
+        description = _meta(soup, 'og:description') or _meta(soup, 'description')
+        if description:
+            match = _OG_CAPTION_PATTERN.match(description)
+            caption = match.group(1) if match else description
+
+    return {
+        'image_url': image_url,
+        'text_content': (caption or '').strip(),
+        'text_source': 'caption',
+        'url': url
+    }
+
+
+def scrape_post_html(url: str) -> Optional[Dict[str, Any]]:
+    """Browserless fast path: fetch the post HTML and parse it
+
+    Returns the same dict shape as extract_instagram_content, or None when the
+    page lacks a qualifying image or caption and the browser must be used.
+    """
+    try:
+        response = http_client.get(url, headers=PAGE_HEADERS, timeout=FETCH_TIMEOUT,
+                                   max_bytes=MAX_PAGE_BYTES)
+    except requests.RequestException as e:
+        print(f"⚠️ Fast path fetch failed: {str(e)}")
+        return None
+
+    content = parse_post_html(response.text, url)
+    if content['image_url'] and content['text_content']:
+        return content
+    return None
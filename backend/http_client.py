@@ -0,0 +1,173 @@
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Dict, Mapping, Optional, Tuple, Union
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.util.retry import Retry
+
+CONNECT_TIMEOUT = float(os.environ.get('HTTP_CONNECT_TIMEOUT', 5))
+READ_TIMEOUT = float(os.environ.get('HTTP_READ_TIMEOUT', 15))
+PER_HOST_LIMIT = int(os.environ.get('HTTP_PER_HOST_LIMIT', 8))
+MAX_BODY_BYTES = int(os.environ.get('HTTP_MAX_BODY_BYTES', 20 * 1024 * 1024))
+
+
+class ResponseTooLarge(requests.RequestException):
+    """Raised when a response body exceeds the allowed size"""
+
+
+class FetchResult:
+    """Fully read response body plus the metadata callers need"""
+
+    def __init__(self, url: str, status_code: int, headers: Mapping[str, str],
+                 content: bytes, from_cache: bool = False):
+        self.url = url
+        self.status_code = status_code
+        # Header lookups (charset, validators) must ignore the server's casing
+        self.headers = CaseInsensitiveDict(headers)
+        self.content = content
+        self.from_cache = from_cache
+
+    @property
+    def text(self) -> str:
+        encoding = requests.utils.get_encoding_from_headers(self.headers) or 'utf-8'
+        return self.content.decode(encoding, errors='replace')
+
+
+class _HostStats:
+    """Request counts and latency samples per host"""
+
+    def __init__(self, window: int = 200):
+        self._lock = threading.Lock()
+        self._window = window
+        self._hosts: Dict[str, Dict[str, Any]] = {}
+
+    def record(self, host: str, seconds: float, nbytes: int, error: bool):
+        with self._lock:
+            stats = self._hosts.setdefault(host, {
+                'requests': 0, 'errors': 0, 'bytes': 0, 'samples': deque(maxlen=self._window)
+            })
+            stats['requests'] += 1
+            stats['errors'] += int(error)
+            stats['bytes'] += nbytes
+            stats['samples'].append(seconds)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            result = {}
+            for host, stats in self._hosts.items():
+                ordered = sorted(stats['samples'])
+                result[host] = {
+                    'requests': stats['requests'],
+                    'errors': stats['errors'],
+                    'bytes': stats['bytes'],
+                    'p50_seconds': ordered[len(ordered) // 2] if ordered else 0.0,
+                    'p95_seconds': ordered[int(len(ordered) * 0.95)] if ordered else 0.0,
+                }
+            return result
+
+
+class HTTPClient:
+    """Shared outbound HTTP layer
+
+    One pooled keep-alive session with retries and backoff on transient
+    failures, a cap on concurrent requests per host, connect/read timeouts,
+    a maximum body size and optional conditional GETs against an in-memory
+    validator cache.
+    """
+
+    def __init__(self, per_host_limit: int = PER_HOST_LIMIT,
+                 timeout: Tuple[float, float] = (CONNECT_TIMEOUT, READ_TIMEOUT),
+                 max_bytes: int = MAX_BODY_BYTES, conditional_entries: int = 64,
+                 headers: Optional[Dict[str, str]] = None):
+        self.per_host_limit = per_host_limit
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self.session = requests.Session()
+        retry = Retry(
+            total=3, backoff_factor=0.3,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset({'GET', 'HEAD'}),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=per_host_limit, max_retries=retry)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        if headers:
+            self.session.headers.update(headers)
+
+        self._lock = threading.Lock()
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._validators: "OrderedDict[str, FetchResult]" = OrderedDict()
+        self._conditional_entries = conditional_entries
+        self._stats = _HostStats()
+
+    def _slot(self, host: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = threading.BoundedSemaphore(self.per_host_limit)
+            return self._host_slots[host]
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None,
+            timeout: Optional[Union[float, Tuple[float, float]]] = None,
+            max_bytes: Optional[int] = None, conditional: bool = False) -> FetchResult:
+        """GET a URL and read its body, raising requests exceptions on failure"""
+        host = urlsplit(url).netloc
+        limit = max_bytes or self.max_bytes
+        request_headers = dict(headers or {})
+
+        cached = None
+        if conditional:
+            with self._lock:
+                cached = self._validators.get(url)
+            if cached:
+                if cached.headers.get('ETag'):
+                    request_headers['If-None-Match'] = cached.headers['ETag']
+                if cached.headers.get('Last-Modified'):
+                    request_headers['If-Modified-Since'] = cached.headers['Last-Modified']
+
+        started = time.monotonic()
+        nbytes = 0
+        error = True
+        try:
+            with self._slot(host):
+                with self.session.get(url, headers=request_headers, timeout=timeout or self.timeout,
+                                      stream=True) as response:
+                    if response.status_code == 304 and cached:
+                        error = False
+                        return FetchResult(url, 200, cached.headers, cached.content, from_cache=True)
+                    response.raise_for_status()
+
+                    declared = response.headers.get('Content-Length')
+                    if declared and declared.isdigit() and int(declared) > limit:
+                        raise ResponseTooLarge(f"{url} is {declared} bytes, limit is {limit}")
+                    chunks = []
+                    for chunk in response.iter_content(64 * 1024):
+                        nbytes += len(chunk)
+                        if nbytes > limit:
+                            raise ResponseTooLarge(f"{url} exceeded {limit} bytes")
+                        chunks.append(chunk)
+                    result = FetchResult(response.url, response.status_code,
+                                         response.headers, b''.join(chunks))
+            error = False
+        finally:
+            self._stats.record(host, time.monotonic() - started, nbytes, error)
+
+        if conditional and (result.headers.get('ETag') or result.headers.get('Last-Modified')):
+            with self._lock:
+                self._validators[url] = result
+                self._validators.move_to_end(url)
+                while len(self._validators) > self._conditional_entries:
+                    self._validators.popitem(last=False)
+        return result
+
+    def host_stats(self) -> Dict[str, Dict[str, float]]:
+        """Per-host request counts, bytes and latency percentiles"""
+        return self._stats.snapshot()
+
+
+http_client = HTTPClient()
@@ -0,0 +1,339 @@
+import functools
+import re
+from typing import Dict, Optional, Tuple
+
+OTHER_SECTION = 'Other'
+
+# Canonical ingredient names by store section, each with the other names
+# recipes use for it
+CATALOG = {
+    'Produce': {
+        'garlic': ('garlic clove', 'garlic bulb', 'head of garlic'),
+        'onion': ('yellow onion', 'white onion', 'brown onion', 'sweet onion'),
+        'red onion': ('purple onion',),
+        'shallot': (),
+        'green onion': ('scallion', 'spring onion', 'green onions'),
+        'ginger': ('fresh ginger', 'ginger root', 'gingerroot'),
+        'tomato': ('roma tomato', 'plum tomato', 'vine tomato'),
+        'cherry tomato': ('grape tomato',),
+        'potato': ('russet potato', 'yukon gold potato', 'gold potato', 'baby potato'),
+        'sweet potato': ('yam',),
+        'carrot': ('baby carrot',),
+        'celery': ('celery stalk', 'celery rib'),
+        'bell pepper': ('red bell pepper', 'green bell pepper', 'yellow bell pepper', 'capsicum',
+                        'red pepper', 'green pepper'),
+        'jalapeno': ('jalapeño', 'jalapeno pepper'),
+        'chili pepper': ('chile', 'chili', 'red chili', 'thai chili', 'serrano pepper'),
+        'zucchini': ('courgette',),
+        'eggplant': ('aubergine',),
+        'cucumber': ('english cucumber',),
+        'broccoli': ('broccoli floret',),
+        'cauliflower': ('cauliflower floret',),
+        'spinach': ('baby spinach',),
+        'kale': ('lacinato kale', 'tuscan kale'),
+        'lettuce': ('romaine', 'romaine lettuce', 'iceberg lettuce', 'butter lettuce'),
+        'cabbage': ('green cabbage', 'red cabbage', 'napa cabbage'),
+        'mushroom': ('cremini mushroom', 'button mushroom', 'baby bella mushroom', 'white mushroom'),
+        'avocado': (),
+        'corn': ('corn kernel', 'sweet corn', 'corn on the cob'),
+        'green bean': ('string bean',),
+        'asparagus': (),
+        'lemon': (),
+        'lime': (),
+        'orange': (),
+        'apple': (),
+        'banana': (),
+        'strawberry': (),
+        'blueberry': (),
+        'raspberry': (),
+        'cilantro': ('coriander leaf', 'fresh coriander'),
+        'parsley': ('flat-leaf parsley', 'italian parsley', 'curly parsley'),
+        'basil': ('fresh basil', 'basil leaf', 'thai basil'),
+        'mint': ('mint leaf',),
+        'dill': ('fresh dill',),
+        'rosemary': ('fresh rosemary',),
+        'thyme': ('fresh thyme',),
+    },
+    'Meat & Seafood': {
+        'chicken breast': ('boneless skinless chicken breast', 'chicken breast fillet'),
+        'chicken thigh': ('boneless skinless chicken thigh', 'bone-in chicken thigh'),
+        'chicken': ('whole chicken', 'chicken drumstick', 'chicken wing'),
+        'ground beef': ('minced beef', 'beef mince', 'lean ground beef'),
+        'beef steak': ('steak', 'sirloin', 'ribeye', 'flank steak', 'skirt steak'),
+        'ground turkey': ('turkey mince',),
+        'pork': ('pork loin', 'pork shoulder', 'pork tenderloin', 'pork chop'),
+        'ground pork': ('pork mince',),
+        'bacon': ('bacon strip', 'bacon slice'),
+        'sausage': ('italian sausage', 'chorizo'),
+        'salmon': ('salmon fillet',),
+        'shrimp': ('prawn', 'large shrimp', 'jumbo shrimp'),
+        'white fish': ('cod', 'tilapia', 'halibut', 'cod fillet'),
+        'tuna': ('tuna steak',),
+    },
+    'Dairy & Eggs': {
+        'egg': ('large egg', 'eggs', 'whole egg'),
+        'egg white': (),
+        'egg yolk': (),
+        'butter': ('unsalted butter', 'salted butter'),
+        'milk': ('whole milk', '2% milk', 'skim milk'),
+        'almond milk': ('unsweetened almond milk',),
+        'oat milk': (),
+        'soy milk': (),
+        'heavy cream': ('heavy whipping cream', 'whipping cream', 'double cream'),
+        'sour cream': (),
+        'cream cheese': (),
+        'greek yogurt': ('plain greek yogurt',),
+        'yogurt': ('plain yogurt', 'natural yogurt'),
+        'parmesan cheese': ('parmesan', 'parmigiano reggiano', 'parmigiano-reggiano'),
+        'cheddar cheese': ('cheddar', 'sharp cheddar'),
+        'mozzarella cheese': ('mozzarella', 'fresh mozzarella'),
+        'feta cheese': ('feta',),
+        'ricotta cheese': ('ricotta',),
+    },
+    'Bakery': {
+        'bread': ('sourdough bread', 'white bread', 'whole wheat bread'),
+        'tortilla': ('flour tortilla', 'corn tortilla'),
+        'burger bun': ('hamburger bun', 'brioche bun'),
+        'pita': ('pita bread',),
+    },
+    'Pasta & Grains': {
+        'pasta': ('dried pasta', 'short pasta'),
+        'spaghetti': ('spaghetti pasta', 'spaghettini'),
+        'penne': ('penne pasta', 'penne rigate'),
+        'fusilli': ('fusilli pasta', 'rotini'),
+        'rigatoni': ('rigatoni pasta',),
+        'linguine': ('linguine pasta',),
+        'fettuccine': ('fettuccine pasta', 'fettuccini'),
+        'macaroni': ('elbow macaroni', 'macaroni pasta'),
+        'orzo': ('orzo pasta',),
+        'lasagna noodles': ('lasagna sheets', 'lasagne sheets'),
+        'egg noodles': ('noodles',),
+        'rice noodles': (),
+        'white rice': ('rice', 'jasmine rice', 'basmati rice', 'long grain rice'),
+        'brown rice': (),
+        'arborio rice': ('risotto rice',),
+        'quinoa': (),
+        'rolled oats': ('oats', 'old-fashioned oats', 'oatmeal'),
+        'couscous': (),
+        'breadcrumbs': ('panko', 'panko breadcrumbs', 'bread crumbs'),
+    },
+    'Canned & Jarred': {
+        'canned tomatoes': ('diced tomatoes', 'crushed tomatoes', 'whole peeled tomatoes',
+                            'canned diced tomatoes', 'san marzano tomatoes'),
+        'tomato paste': (),
+        'tomato sauce': ('marinara', 'marinara sauce', 'passata'),
+        'sun-dried tomatoes': ('sun dried tomatoes', 'sundried tomatoes'),
+        'chickpeas': ('garbanzo beans', 'canned chickpeas'),
+        'black beans': ('canned black beans',),
+        'kidney beans': ('red kidney beans',),
+        'white beans': ('cannellini beans', 'great northern beans'),
+        'lentils': ('red lentils', 'green lentils', 'brown lentils'),
+        'coconut milk': ('canned coconut milk', 'full-fat coconut milk'),
+        'chicken broth': ('chicken stock',),
+        'vegetable broth': ('vegetable stock',),
+        'beef broth': ('beef stock',),
+    },
+    'Oils & Condiments': {
+        'olive oil': ('extra virgin olive oil', 'evoo', 'extra-virgin olive oil'),
+        'vegetable oil': ('canola oil', 'neutral oil', 'sunflower oil', 'avocado oil'),
+        'sesame oil': ('toasted sesame oil',),
+        'coconut oil': (),
+        'soy sauce': ('low sodium soy sauce', 'tamari', 'light soy sauce', 'dark soy sauce'),
+        'fish sauce': (),
+        'oyster sauce': (),
+        'hot sauce': ('sriracha', 'chili sauce'),
+        'vinegar': ('white vinegar', 'apple cider vinegar', 'red wine vinegar', 'rice vinegar',
+                    'balsamic vinegar'),
+        'dijon mustard': ('mustard', 'whole grain mustard'),
+        'mayonnaise': ('mayo',),
+        'ketchup': (),
+        'honey': (),
+        'maple syrup': ('pure maple syrup',),
+        'peanut butter': (),
+        'tahini': (),
+        'pesto': ('basil pesto',),
+    },
+    'Baking': {
+        'all-purpose flour': ('flour', 'plain flour', 'all purpose flour', 'ap flour'),
+        'sugar': ('granulated sugar', 'white sugar', 'caster sugar'),
+        'brown sugar': ('light brown sugar', 'dark brown sugar'),
+        'powdered sugar': ("confectioners' sugar", 'icing sugar'),
+        'baking powder': (),
+        'baking soda': ('bicarbonate of soda',),
+        'cornstarch': ('corn starch', 'cornflour'),
+        'yeast': ('active dry yeast', 'instant yeast'),
+        'vanilla extract': ('vanilla', 'pure vanilla extract'),
+        'cocoa powder': ('unsweetened cocoa powder',),
+        'chocolate chips': ('semisweet chocolate chips', 'dark chocolate chips'),
+    },
+    'Spices & Seasonings': {
+        'salt': ('kosher salt', 'sea salt', 'table salt', 'flaky salt'),
+        'black pepper': ('pepper', 'ground black pepper', 'freshly ground black pepper', 'peppercorns'),
+        'garlic powder': (),
+        'onion powder': (),
+        'paprika': ('smoked paprika', 'sweet paprika'),
+        'chili powder': (),
+        'cayenne pepper': ('cayenne',),
+        'red pepper flakes': ('crushed red pepper', 'chili flakes', 'red chili flakes'),
+        'cumin': ('ground cumin', 'cumin seeds'),
+        'coriander': ('ground coriander',),
+        'turmeric': ('ground turmeric',),
+        'cinnamon': ('ground cinnamon', 'cinnamon stick'),
+        'nutmeg': ('ground nutmeg',),
+        'oregano': ('dried oregano',),
+        'italian seasoning': (),
+        'curry powder': (),
+        'garam masala': (),
+        'bay leaf': ('bay leaves',),
+    },
+    'Nuts & Seeds': {
+        'almonds': ('sliced almonds', 'slivered almonds'),
+        'walnuts': (),
+        'cashews': (),
+        'peanuts': (),
+        'pine nuts': (),
+        'sesame seeds': (),
+        'chia seeds': (),
+    },
+    'Frozen': {
+        'frozen peas': ('peas', 'green peas'),
+        'frozen corn': (),
+        'frozen spinach': (),
+    },
+    'Beverages': {
+        'white wine': ('dry white wine',),
+        'red wine': ('dry red wine',),
+    },
+}
+
+# Store section for ingredients outside the catalog, by recipe category
+CATEGORY_SECTIONS = {
+    'produce': 'Produce', 'vegetable': 'Produce', 'vegetables': 'Produce', 'fruit': 'Produce',
+    'fruits': 'Produce', 'herbs': 'Produce', 'herb': 'Produce',
+    'protein': 'Meat & Seafood', 'meat': 'Meat & Seafood', 'seafood': 'Meat & Seafood',
+    'poultry': 'Meat & Seafood', 'fish': 'Meat & Seafood',
+    'dairy': 'Dairy & Eggs', 'eggs': 'Dairy & Eggs', 'cheese': 'Dairy & Eggs',
+    'bakery': 'Bakery', 'bread': 'Bakery',
+    'grains': 'Pasta & Grains', 'grain': 'Pasta & Grains', 'pasta': 'Pasta & Grains',
+    'canned': 'Canned & Jarred', 'legumes': 'Canned & Jarred',
+    'oils': 'Oils & Condiments', 'oil': 'Oils & Condiments', 'condiments': 'Oils & Condiments',
+    'sauces': 'Oils & Condiments', 'sauce': 'Oils & Condiments',
+    'baking': 'Baking', 'sweeteners': 'Baking',
+    'spices': 'Spices & Seasonings', 'spice': 'Spices & Seasonings', 'seasoning': 'Spices & Seasonings',
+    'seasonings': 'Spices & Seasonings',
+    'nuts': 'Nuts & Seeds', 'seeds': 'Nuts & Seeds',
+    'frozen': 'Frozen', 'beverages': 'Beverages', 'alcohol': 'Beverages',
+    'pantry': 'Pantry',
+}
+
+# Nobody shops for these
+NOT_BOUGHT = frozenset({'water', 'ice', 'ice cube', 'hot water', 'cold water', 'warm water', 'boiling water'})
+
+# Preparation words that don't change what you buy
+DESCRIPTORS = frozenset({
+    'fresh', 'freshly', 'chopped', 'minced', 'diced', 'sliced', 'grated', 'shredded', 'crushed',
+    'finely', 'roughly', 'coarsely', 'thinly', 'thickly', 'large', 'small', 'medium', 'organic',
+    'ripe', 'peeled', 'cubed', 'boneless', 'skinless', 'halved', 'quartered', 'softened', 'melted', 'trimmed', 'rinsed',
+    'drained', 'cooked', 'uncooked', 'raw', 'dried', 'packed', 'heaping', 'level', 'optional',
+    'about', 'divided', 'plus', 'more', 'to', 'taste', 'for', 'serving', 'garnish', 'and', 'or', 'of',
+})
+
+# Qualifiers that can be dropped from the front of a name without changing
+# which catalog item it is ("extra sharp cheddar cheese"). Anything else in
+# front ("almond flour", "garlic salt") names a different product.
+QUALIFIERS = DESCRIPTORS | frozenset({
+    'extra', 'sharp', 'mild', 'aged', 'good', 'quality', 'good-quality', 'best', 'premium', 'virgin',
+    'extra-virgin', 'salted', 'unsalted', 'sweetened', 'unsweetened', 'low', 'reduced', 'fat', 'low-fat',
+    'full-fat', 'nonfat', 'non-fat', 'sodium', 'low-sodium', 'lean', 'extra-lean', 'whole', 'plain',
+    'pure', 'natural', 'homemade', 'store-bought', 'jumbo', 'baby', 'young', 'firm', 'hot', 'cold', 'warm',
+})
+
+_PARENTHETICAL = re.compile(r'\([^)]*\)')
+_NON_WORD = re.compile(r"[^a-z0-9%'\- ]+")
+
+
+IRREGULAR_PLURALS = {'leaves': 'leaf', 'halves': 'half', 'loaves': 'loaf', 'knives': 'knife'}
+
+
+def singular(word: str) -> str:
+    """Naive singular of a plural English noun"""
+    if word in IRREGULAR_PLURALS:
+        return IRREGULAR_PLURALS[word]
+    if len(word) > 4 and word.endswith('ies'):
+        return word[:-3] + 'y'
+    if len(word) > 4 and word.endswith('oes'):
+        return word[:-2]
+    if len(word) > 3 and word.endswith('s') and not word.endswith(('ss', 'us', 'is')):
+        return word[:-1]
+    return word
+
+
+def clean_name(name: str) -> str:
+    """Lower-case with parentheticals and punctuation removed"""
+    text = _PARENTHETICAL.sub(' ', name.lower())
+    return ' '.join(_NON_WORD.sub(' ', text).split())
+
+
+def _variants(name: str):
+    words = name.split()
+    yield name
+    if words:
+        yield ' '.join(words[:-1] + [singular(words[-1])])
+
+
+@functools.lru_cache(maxsize=None)
+def _index() -> Dict[str, Tuple[str, str]]:
+    """Every known spelling, singular and plural, -> (canonical name, section)"""
+    index = {}
+    for section, entries in CATALOG.items():
+        for canonical, aliases in entries.items():
+            for spelling in (canonical,) + aliases:
+                for variant in _variants(clean_name(spelling)):
+                    index.setdefault(variant, (canonical, section))
+    return index
+
+
+@functools.lru_cache(maxsize=4096)
+def lookup(name: str) -> Optional[Tuple[str, str]]:
+    """Canonical name and store section of an ingredient, or None if unknown
+
+    Tries the text before any comma ("chicken breast, cut into cubes"), then
+    the whole name, each as written, without preparation words, and with
+    leading QUALIFIERS dropped one at a time ("extra sharp cheddar cheese"
+    finds "cheddar cheese"). Names that only end in a known item, like
+    "almond flour", are not that item and come back None.
+    """
+    index = _index()
+    for text in dict.fromkeys((name.split(',')[0], name)):
+        cleaned = clean_name(text)
+        plain = ' '.join(word for word in cleaned.split() if word not in DESCRIPTORS)
+        for candidate in (cleaned, plain):
+            words = candidate.split()
+            for start in range(len(words)):
+                if start and words[start - 1] not in QUALIFIERS:
+                    break
+                for variant in _variants(' '.join(words[start:])):
+                    if variant in index:
+                        return index[variant]
+    return None
+
+
+def canonical_name(name: str) -> str:
+    """Name to list an ingredient under, even when it isn't in the catalog"""
+    found = lookup(name)
+    if found:
+        return found[0]
+    cleaned = clean_name(name.split(',')[0])
+    plain = ' '.join(word for word in cleaned.split() if word not in DESCRIPTORS)
+    return plain or cleaned or name.strip().lower()
+
+
+def store_section(name: str, category: Optional[str] = None) -> str:
+    found = lookup(name)
+    if found:
+        return found[1]
+    return CATEGORY_SECTIONS.get((category or '').strip().lower(), OTHER_SECTION)
+
+
+def is_bought(name: str) -> bool:
+    return clean_name(name) not in NOT_BOUGHT
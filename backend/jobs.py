@@ -0,0 +1,136 @@
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+JOB_WORKERS = int(os.environ.get('JOB_WORKERS', 4))
+JOB_QUEUE_LIMIT = int(os.environ.get('JOB_QUEUE_LIMIT', 100))
+JOB_TTL = float(os.environ.get('JOB_TTL', 3600))
+
+
+class QueueFullError(Exception):
+    """Raised when too many jobs are already waiting to run"""
+
+
+class Job:
+    """One extraction run and the progress events it has emitted so far"""
+
+    def __init__(self, url: str):
+        self.id = uuid.uuid4().hex
+        self.url = url
+        self.status = 'queued'
+        self.events: List[Dict[str, Any]] = []
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self._changed = threading.Condition()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ('succeeded', 'failed')
+
+    def emit(self, stage: str, status: str):
+        with self._changed:
+            self.events.append({'stage': stage, 'status': status, 'at': time.time()})
+            self._changed.notify_all()
+
+    def finish(self, result: Optional[Dict[str, Any]] = None, error: Optional[str] = None):
+        with self._changed:
+            self.result = result
+            self.error = error
+            self.status = 'failed' if error else 'succeeded'
+            self.finished_at = time.time()
+            self._changed.notify_all()
+
+    def wait_for_events(self, seen: int, timeout: float) -> List[Dict[str, Any]]:
+        """Block until there are events past ``seen`` or the job finishes"""
+        with self._changed:
+            self._changed.wait_for(lambda: len(self.events) > seen or self.finished, timeout)
+            return self.events[seen:]
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._changed:
+            return {
+                'id': self.id,
+                'url': self.url,
+                'status': self.status,
+                'stages': list(self.events),
+                'result': self.result,
+                'error': self.error,
+                'created_at': self.created_at,
+                'finished_at': self.finished_at,
+            }
+
+
+class JobManager:
+    """Runs extractions on a bounded worker pool and tracks their progress
+
+    ``run`` is called as ``run(url, progress)`` and must return an object
+    with a ``dict()`` method; raising marks the job failed with the
+    exception message.
+    """
+
+    def __init__(self, run: Callable[..., Any], max_workers: int = JOB_WORKERS,
+                 queue_limit: int = JOB_QUEUE_LIMIT, ttl: float = JOB_TTL):
+        self._run = run
+        self.queue_limit = queue_limit
+        self.ttl = ttl
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='job')
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, Job] = {}
+
+    def submit(self, url: str) -> Job:
+        self._prune()
+        with self._lock:
+            pending = sum(1 for job in self._jobs.values() if job.status == 'queued')
+            if pending >= self.queue_limit:
+                raise QueueFullError(f"{pending} jobs already queued")
+            job = Job(url)
+            self._jobs[job.id] = job
+        self._executor.submit(self._execute, job)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _execute(self, job: Job):
+        job.status = 'running'
+        job.emit('job', 'started')
+        try:
+            result = self._run(job.url, job.emit)
+        except Exception as e:
+            job.finish(error=str(e))
+        else:
+            job.finish(result=result.dict())
+
+    def _prune(self):
+        """Forget finished jobs older than the TTL"""
+        cutoff = time.time() - self.ttl
+        with self._lock:
+            for job_id in [job_id for job_id, job in self._jobs.items()
+                           if job.finished and job.finished_at < cutoff]:
+                del self._jobs[job_id]
+
+    def stream(self, job: Job, heartbeat: float = 15) -> Iterator[Dict[str, Any]]:
+        """Yield progress events as they happen, then the final job state
+
+        Yields ``None`` every ``heartbeat`` seconds without news so callers
+        can keep idle connections open.
+        """
+        seen = 0
+        while True:
+            events = job.wait_for_events(seen, heartbeat)
+            seen += len(events)
+            if not events and not job.finished:
+                yield None
+            for event in events:
+                yield event
+            if job.finished and seen == len(job.events):
+                return
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
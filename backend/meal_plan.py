@@ -0,0 +1,72 @@
+import argparse
+import json
+import sys
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+from shopping_list import ShoppingIndex, group_by_section
+from units import format_amount
+
+
+def aggregate_meal_plan(recipes: Sequence[Any], servings: Optional[Sequence[Optional[int]]] = None) -> List[Dict[str, Any]]:
+    """One shopping list for a whole meal plan
+
+    Every recipe's ingredients go into a single ShoppingIndex, so the same
+    ingredient across recipes is summed once names and units are normalized
+    ("2 tbsp butter" in one recipe and "1/2 cup butter" in another become one
+    line). ``servings`` optionally gives how many servings of each recipe to
+    cook. Returns ShoppingItem-shaped dicts ordered by store section and name.
+    """
+    index = ShoppingIndex()
+    for position, recipe in enumerate(recipes):
+        wanted = servings[position] if servings else None
+        factor = wanted / recipe.servings if wanted and recipe.servings else 1.0
+        index.add_ingredients(recipe.ingredients, factor)
+    return index.items()
+
+
+def plan_sections(items: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [{'store_section': section, 'items': entries} for section, entries in group_by_section(items).items()]
+
+
+def _load_recipes(sources: List[str]) -> List[Any]:
+    import recipe_extractor
+
+    recipes = []
+    for source in sources:
+        if source.startswith(('http://', 'https://')):
+            recipe = recipe_extractor.stored_recipe(source)
+            if not recipe:
+                raise SystemExit(f"❌ Recipe not found: {source}")
+            recipes.append(recipe)
+            continue
+        with open(source, encoding='utf-8') as f:
+            data = json.load(f)
+        for item in data if isinstance(data, list) else [data]:
+            recipes.append(recipe_extractor.Recipe(**item))
+    return recipes
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Combined shopping list for a meal plan")
+    parser.add_argument('recipes', nargs='+',
+                        help="recipe JSON files (one recipe or a list) or source URLs of extracted recipes")
+    parser.add_argument('-s', '--servings', type=int, help="cook every recipe for this many servings")
+    parser.add_argument('--json', action='store_true', help="print the list as JSON")
+    args = parser.parse_args(argv)
+
+    recipes = _load_recipes(args.recipes)
+    items = aggregate_meal_plan(recipes, [args.servings] * len(recipes) if args.servings else None)
+
+    if args.json:
+        print(json.dumps({'recipes': len(recipes), 'sections': plan_sections(items)}, indent=2))
+        return 0
+
+    print(f"🛒 SHOPPING LIST ({len(recipes)} recipes)")
+    for section, entries in group_by_section(items).items():
+        print(f"\n{section}:")
+        for item in entries:
+            print(f"• {format_amount(item['amount'])} {item['unit']} {item['name']}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,139 @@
+import functools
+import numbers
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# Pipeline stages range from sub-second cache hits to multi-minute transcriptions
+STAGE_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300)
+
+
+@functools.lru_cache(maxsize=None)
+def stage_metrics() -> Dict[str, Any]:
+    """Prometheus metrics shared by every stage, created on first use
+
+    prometheus_client is only imported once something is measured, so
+    importing the pipeline stays cheap.
+    """
+    from prometheus_client import Counter, Gauge, Histogram
+
+    return {
+        'seconds': Histogram('recipe_stage_seconds', "Time spent in each pipeline stage",
+                             ['stage'], buckets=STAGE_BUCKETS),
+        'errors': Counter('recipe_stage_errors_total',
+                          "Stage runs that raised or produced no result", ['stage']),
+        'bytes': Counter('recipe_stage_bytes_total', "Bytes transferred or produced by each stage",
+                         ['stage']),
+        'in_flight': Gauge('recipe_stage_in_flight', "Stage runs currently executing", ['stage']),
+        'prompt_tokens': Counter('recipe_prompt_tokens_total',
+                                 "Estimated model input tokens of post text, before and after trimming", ['kind']),
+    }
+
+
+def _no_result(result: Any) -> bool:
+    return result is None
+
+
+def timed(stage: str, func: Callable, *args,
+          bytes_of: Optional[Callable[[Any], int]] = None,
+          failed: Callable[[Any], bool] = _no_result, **kwargs) -> Any:
+    """Call func and record its latency, outcome and bytes under ``stage``
+
+    Pipeline functions report most failures by returning None rather than
+    raising, so ``failed`` decides from the result whether the run counts as
+    an error. ``bytes_of`` extracts the bytes moved from a successful result.
+    """
+    metrics = stage_metrics()
+    in_flight = metrics['in_flight'].labels(stage)
+    in_flight.inc()
+    started = time.perf_counter()
+    try:
+        result = func(*args, **kwargs)
+    except Exception:
+        metrics['errors'].labels(stage).inc()
+        raise
+    finally:
+        metrics['seconds'].labels(stage).observe(time.perf_counter() - started)
+        in_flight.dec()
+
+    if failed(result):
+        metrics['errors'].labels(stage).inc()
+    elif bytes_of:
+        metrics['bytes'].labels(stage).inc(bytes_of(result) or 0)
+    return result
+
+
+def record_prompt_tokens(before: int, after: int) -> None:
+    tokens = stage_metrics()['prompt_tokens']
+    tokens.labels('before').inc(before)
+    tokens.labels('after').inc(after)
+
+
+def instrument(stage: str, bytes_of: Optional[Callable[[Any], int]] = None,
+               failed: Callable[[Any], bool] = _no_result):
+    """Decorator form of timed()"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return timed(stage, func, *args, bytes_of=bytes_of, failed=failed, **kwargs)
+        return wrapper
+    return decorator
+
+
+class StatsCollector:
+    """Exposes in-process stats snapshots as Prometheus gauges
+
+    ``snapshot`` returns ``{source: stats}`` where stats is a flat dict of
+    numbers, a dict of such dicts keyed by something like a host or cache
+    namespace, or None when that component hasn't started. Nested keys become
+    the label named in ``labels[source]``.
+    """
+
+    def __init__(self, snapshot: Callable[[], Dict[str, Optional[Dict[str, Any]]]],
+                 labels: Dict[str, str]):
+        self.snapshot = snapshot
+        self.labels = labels
+
+    def collect(self):
+        from prometheus_client.core import GaugeMetricFamily
+
+        try:
+            sources = self.snapshot()
+        except Exception as e:
+            print(f"⚠️ Could not collect stats: {str(e)}")
+            return
+
+        for source, stats in sources.items():
+            if not stats:
+                continue
+            label = self.labels.get(source, 'name')
+            families: Dict[str, GaugeMetricFamily] = {}
+            for key, value in stats.items():
+                if isinstance(value, dict):
+                    for field, number in value.items():
+                        if not isinstance(number, numbers.Number):
+                            continue
+                        name = f"recipe_{source}_{field}"
+                        if name not in families:
+                            families[name] = GaugeMetricFamily(name, f"{source} {field}", labels=[label])
+                        families[name].add_metric([str(key)], number)
+                elif isinstance(value, numbers.Number):
+                    name = f"recipe_{source}_{key}"
+                    families[name] = GaugeMetricFamily(name, f"{source} {key}", value=value)
+            yield from families.values()
+
+
+@functools.lru_cache(maxsize=None)
+def register_stats(snapshot: Callable[[], Dict[str, Optional[Dict[str, Any]]]],
+                   labels: Tuple[Tuple[str, str], ...] = ()):
+    """Add a StatsCollector to the default registry once per snapshot function"""
+    from prometheus_client import REGISTRY
+
+    REGISTRY.register(StatsCollector(snapshot, dict(labels)))
+
+
+def metrics_payload() -> Tuple[bytes, str]:
+    """Current metrics in the Prometheus text format, with its content type"""
+    from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+    stage_metrics()
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -0,0 +1,146 @@
+import csv
+import functools
+import os
+from typing import Any, Dict, List, Optional, Sequence
+import numpy as np
+from ingredients import lookup
+from units import normalize_unit, to_base
+
+NUTRITION_TABLE = os.environ.get(
+    'NUTRITION_TABLE', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'nutrition.csv'))
+
+# Columns of the table, per 100 g
+NUTRIENTS = ('calories', 'protein_g', 'carbs_g', 'fat_g', 'fiber_g', 'sugar_g', 'saturated_fat_g')
+
+# Count-like units with a per-ingredient weight column (``<unit>_g``). A can
+# of tomatoes and a can of tuna weigh different amounts, so an ingredient
+# without a weight for its unit is left unresolved rather than guessed.
+UNIT_COLUMNS = ('clove', 'slice', 'stick', 'can', 'jar', 'package', 'bunch', 'head', 'sprig', 'pinch',
+                'dash', 'handful')
+_UNIT_COLUMN = {unit: i for i, unit in enumerate(UNIT_COLUMNS)}
+
+_MASS, _VOLUME, _PIECE, _UNIT = range(4)
+
+
+def _number(text: str) -> float:
+    return float(text) if text.strip() else np.nan
+
+
+class NutritionTable:
+    """Per-100 g nutrients, densities and piece and unit weights as NumPy arrays"""
+
+    def __init__(self, path: str = NUTRITION_TABLE):
+        with open(path, newline='', encoding='utf-8') as source:
+            rows = list(csv.DictReader(source))
+        self.names = [row['name'] for row in rows]
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.per_100g = np.array([[float(row[column]) for column in NUTRIENTS] for row in rows])
+        self.density = np.array([_number(row['density_g_per_ml']) for row in rows])
+        self.piece_g = np.array([_number(row['piece_g']) for row in rows])
+        self.unit_g = np.array([[_number(row[f'{unit}_g']) for unit in UNIT_COLUMNS] for row in rows])
+
+    def row(self, name: str) -> int:
+        """Table row for an ingredient name, or -1 if it isn't in the table"""
+        found = lookup(name)
+        return self.index.get(found[0], -1) if found else -1
+
+    def density_of(self, name: str) -> Optional[float]:
+        """Grams per millilitre of an ingredient, if known"""
+        row = self.row(name)
+        if row < 0 or np.isnan(self.density[row]):
+            return None
+        return float(self.density[row])
+
+
+@functools.lru_cache(maxsize=None)
+def nutrition_table() -> NutritionTable:
+    return NutritionTable()
+
+
+def _macros(per_serving: np.ndarray) -> Dict[str, Any]:
+    calories, protein, carbs, fat, fiber, sugar, saturated = (float(value) for value in per_serving)
+    energy = 4 * protein + 4 * carbs + 9 * fat
+    share = (lambda grams, kcal: round(100 * grams * kcal / energy, 1)) if energy else (lambda grams, kcal: 0.0)
+    return {
+        'calories': int(round(calories)),
+        'protein_g': round(protein, 1),
+        'carbs_g': round(carbs, 1),
+        'fat_g': round(fat, 1),
+        'fiber_g': round(fiber, 1),
+        'sugar_g': round(sugar, 1),
+        'saturated_fat_g': round(saturated, 1),
+        'protein_percentage': share(protein, 4),
+        'carbs_percentage': share(carbs, 4),
+        'fat_percentage': share(fat, 9),
+    }
+
+
+def compute_nutrition(recipes: Sequence[Any], table: Optional[NutritionTable] = None) -> List[Dict[str, Any]]:
+    """Per-serving macros for many recipes in one vectorized pass
+
+    Only the name and unit lookups run per ingredient; gram conversion,
+    nutrient scaling and the per-recipe sums are array operations over every
+    ingredient of every recipe at once. For each recipe returns
+    ``{'macros', 'contributions', 'coverage'}``: MacroNutrients fields, each
+    ingredient's per-serving nutrients (None when it couldn't be weighed or
+    isn't in the table) and the share of ingredients that could.
+    """
+    table = table or nutrition_table()
+    rows, amounts, kinds, unit_columns, owners = [], [], [], [], []
+    for position, recipe in enumerate(recipes):
+        for ingredient in recipe.ingredients:
+            base, dim = to_base(ingredient.amount or 0.0, normalize_unit(ingredient.unit))
+            if dim == 'mass':
+                kind = _MASS
+            elif dim == 'volume':
+                kind = _VOLUME
+            elif dim == 'count':
+                kind = _PIECE
+            else:
+                kind = _UNIT
+            rows.append(table.row(ingredient.name))
+            amounts.append(base)
+            kinds.append(kind)
+            unit_columns.append(_UNIT_COLUMN.get(dim, -1))
+            owners.append(position)
+
+    count = len(recipes)
+    rows_arr = np.array(rows, dtype=np.intp)
+    known = rows_arr >= 0
+    safe_rows = np.where(known, rows_arr, 0)
+    kinds_arr = np.array(kinds, dtype=np.int8)
+    owners_arr = np.array(owners, dtype=np.intp)
+    columns = np.array(unit_columns, dtype=np.intp)
+    unit_grams = np.where(columns >= 0, table.unit_g[safe_rows, np.maximum(columns, 0)], np.nan)
+
+    grams_per_unit = np.select(
+        [kinds_arr == _MASS, kinds_arr == _VOLUME, kinds_arr == _PIECE],
+        [np.ones(len(rows)), table.density[safe_rows], table.piece_g[safe_rows]],
+        default=unit_grams
+    )
+    grams = np.where(known, np.array(amounts, dtype=float) * grams_per_unit, np.nan)
+    resolved = ~np.isnan(grams)
+
+    contributions = np.where(resolved[:, None], np.nan_to_num(grams)[:, None] * table.per_100g[safe_rows] / 100, 0.0)
+    servings = np.maximum(np.array([recipe.servings or 1 for recipe in recipes], dtype=float), 1.0)
+    contributions /= servings[owners_arr][:, None]
+
+    per_serving = np.zeros((count, len(NUTRIENTS)))
+    np.add.at(per_serving, owners_arr, contributions)
+    totals = np.bincount(owners_arr, minlength=count)
+    coverage = np.bincount(owners_arr, weights=resolved, minlength=count) / np.maximum(totals, 1)
+
+    results = []
+    offsets = np.concatenate(([0], np.cumsum(totals)))
+    for position in range(count):
+        start, end = offsets[position], offsets[position + 1]
+        results.append({
+            'macros': _macros(per_serving[position]),
+            'contributions': [
+                {name: round(float(value), 2) for name, value in zip(NUTRIENTS, contributions[i])}
+                if resolved[i] else None
+                for i in range(start, end)
+            ],
+            'coverage': float(coverage[position]) if totals[position] else 0.0,
+        })
+    return results
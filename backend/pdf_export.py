@@ -0,0 +1,167 @@
+import hashlib
+import json
+from typing import Optional
+from fpdf import FPDF
+from shopping_list import group_by_section
+from units import format_amount
+
+# Characters the core PDF fonts can't encode, mapped once to close ASCII
+# equivalents instead of chaining str.replace for every field
+PDF_TEXT_TABLE = str.maketrans({
+    '•': '-',      # bullet
+    '…': '...',    # ellipsis
+    '“': '"',
+    '”': '"',
+    '‘': "'",
+    '’': "'",
+    '–': '-',      # en dash
+    '—': '-',      # em dash
+    '\u00a0': ' ',  # no-break space
+})
+
+
+def safe_text(text) -> str:
+    """Convert problematic characters to safe alternatives"""
+    return str(text).translate(PDF_TEXT_TABLE).encode('latin-1', 'replace').decode('latin-1')
+
+
+def recipe_pdf_key(recipe) -> str:
+    """Hash of everything that ends up on the page"""
+    payload = json.dumps(recipe.dict(), sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def new_document() -> FPDF:
+    pdf = FPDF()
+    pdf.set_auto_page_break(auto=True, margin=15)
+    return pdf
+
+
+def add_recipe_pages(pdf: FPDF, recipe, thumbnail_path: Optional[str] = None) -> int:
+    """Lay out one recipe starting on a new page, returning that page number"""
+    pdf.add_page()
+    first_page = pdf.page_no()
+
+    # Add thumbnail if available
+    if thumbnail_path:
+        try:
+            pdf.image(thumbnail_path, x=10, y=10, w=190)
+            pdf.ln(60)
+        except Exception:
+            print("⚠️ Could not add thumbnail to PDF")
+            pdf.ln(10)
+
+    # Title
+    pdf.set_font('Arial', 'B', 24)
+    pdf.cell(0, 10, safe_text(recipe.title), ln=True, align='C')
+    pdf.ln(5)
+
+    # Description
+    pdf.set_font('Arial', '', 12)
+    pdf.multi_cell(0, 10, safe_text(recipe.description))
+    pdf.ln(5)
+
+    # Recipe Info
+    pdf.set_font('Arial', 'B', 14)
+    pdf.cell(0, 10, 'Recipe Information', ln=True)
+    pdf.set_font('Arial', '', 12)
+    pdf.cell(0, 10, f'Cuisine: {safe_text(recipe.cuisine_type)}', ln=True)
+    pdf.cell(0, 10, f'Difficulty: {safe_text(recipe.difficulty)}', ln=True)
+    pdf.cell(0, 10, f'Prep Time: {recipe.prep_time} minutes', ln=True)
+    pdf.cell(0, 10, f'Cook Time: {recipe.cook_time} minutes', ln=True)
+    pdf.cell(0, 10, f'Total Time: {recipe.total_time} minutes', ln=True)
+    pdf.cell(0, 10, f'Servings: {recipe.servings}', ln=True)
+    pdf.ln(5)
+
+    # Nutrition Information
+    macros = recipe.macros
+    pdf.set_font('Arial', 'B', 14)
+    pdf.cell(0, 10, 'Nutrition (per serving)', ln=True)
+    pdf.set_font('Arial', '', 12)
+    pdf.cell(0, 10, f'Calories: {macros.calories}', ln=True)
+    pdf.cell(0, 10, f'Protein: {macros.protein_g:.1f}g ({macros.protein_percentage:.0f}%)', ln=True)
+    pdf.cell(0, 10, f'Carbs: {macros.carbs_g:.1f}g ({macros.carbs_percentage:.0f}%)', ln=True)
+    pdf.cell(0, 10, f'Fat: {macros.fat_g:.1f}g ({macros.fat_percentage:.0f}%)', ln=True)
+    if macros.fiber_g > 0:
+        pdf.cell(0, 10, f'Fiber: {macros.fiber_g:.1f}g', ln=True)
+    if macros.sugar_g > 0:
+        pdf.cell(0, 10, f'Sugar: {macros.sugar_g:.1f}g', ln=True)
+    pdf.ln(5)
+
+    # Ingredients
+    pdf.add_page()
+    pdf.set_font('Arial', 'B', 14)
+    pdf.cell(0, 10, 'Ingredients', ln=True)
+    pdf.set_font('Arial', '', 12)
+    for ing in recipe.ingredients:
+        notes = f" ({safe_text(ing.notes)})" if ing.notes else ""
+        pdf.multi_cell(0, 10, f"- {format_amount(ing.amount)} {safe_text(ing.unit)} {safe_text(ing.name)}{notes}")
+    pdf.ln(5)
+
+    # Equipment
+    pdf.set_font('Arial', 'B', 14)
+    pdf.cell(0, 10, 'Equipment Needed', ln=True)
+    pdf.set_font('Arial', '', 12)
+    for item in recipe.equipment_needed:
+        pdf.cell(0, 10, f"- {safe_text(item)}", ln=True)
+    pdf.ln(5)
+
+    # Instructions
+    pdf.add_page()
+    pdf.set_font('Arial', 'B', 14)
+    pdf.cell(0, 10, 'Instructions', ln=True)
+    pdf.set_font('Arial', '', 12)
+    for step in recipe.steps:
+        duration = f" ({step.duration_minutes} min)" if step.duration_minutes else ""
+        temp = f" at {step.temperature}" if step.temperature else ""
+        pdf.multi_cell(0, 10, f"{step.order}. {safe_text(step.instruction)}{duration}{temp}")
+        if step.tips:
+            pdf.set_font('Arial', 'I', 10)
+            pdf.multi_cell(0, 10, f"Tip: {safe_text(step.tips)}")
+            pdf.set_font('Arial', '', 12)
+        if step.equipment_needed:
+            pdf.set_font('Arial', 'I', 10)
+            pdf.multi_cell(0, 10, f"Equipment: {', '.join(safe_text(eq) for eq in step.equipment_needed)}")
+            pdf.set_font('Arial', '', 12)
+        pdf.ln(2)
+
+    # Tips & Tricks
+    if recipe.tips_and_tricks:
+        pdf.add_page()
+        pdf.set_font('Arial', 'B', 14)
+        pdf.cell(0, 10, 'Tips & Tricks', ln=True)
+        pdf.set_font('Arial', '', 12)
+        for tip in recipe.tips_and_tricks:
+            pdf.multi_cell(0, 10, f"- {safe_text(tip)}")
+        pdf.ln(5)
+
+    # Storage & Reheating
+    pdf.set_font('Arial', 'B', 14)
+    pdf.cell(0, 10, 'Storage & Reheating', ln=True)
+    pdf.set_font('Arial', '', 12)
+    pdf.multi_cell(0, 10, f"Storage: {safe_text(recipe.storage_instructions)}")
+    pdf.multi_cell(0, 10, f"Reheating: {safe_text(recipe.reheating_instructions)}")
+    pdf.ln(5)
+
+    # Shopping List
+    if recipe.shopping_list:
+        pdf.add_page()
+        pdf.set_font('Arial', 'B', 14)
+        pdf.cell(0, 10, 'Shopping List', ln=True)
+
+        for section, items in group_by_section(recipe.shopping_list).items():
+            pdf.set_font('Arial', 'B', 12)
+            pdf.cell(0, 10, safe_text(section), ln=True)
+            pdf.set_font('Arial', '', 12)
+            for item in items:
+                pdf.cell(0, 10, f"- {format_amount(item.amount)} {safe_text(item.unit)} {safe_text(item.name)}", ln=True)
+            pdf.ln(2)
+
+    return first_page
+
+
+def render_recipe_pdf(recipe, thumbnail_path: Optional[str] = None) -> bytes:
+    """Render one recipe to PDF bytes without touching the filesystem"""
+    pdf = new_document()
+    add_recipe_pages(pdf, recipe, thumbnail_path)
+    return pdf.output(dest='S').encode('latin-1')
@@ -0,0 +1,178 @@
+import os
+import re
+from typing import Any, Dict, List, Set, Tuple
+from units import UNIT_ALIASES, UNITS
+
+PROMPT_TOKEN_BUDGET = int(os.environ.get('PROMPT_TOKEN_BUDGET', 1500))
+# Share of a transcript sentence's word trigrams found in the caption for it to count as a repeat
+DUPLICATE_OVERLAP = 0.8
+# Leading caption lines kept for context (title, intro) even without recipe signals
+INTRO_LINES = 2
+
+# Instagram chrome that shows up when the post's <article> or the whole page body is scraped
+UI_LINES = re.compile(
+    r"^(?:like|likes|reply|replies|follow|following|message|share|save|send|more|see more|"
+    r"see translation|view (?:all )?\d[\d,.]*\s*(?:k|m)? ?(?:comments?|replies)|view replies.*|hide replies|"
+    r"log ?in|sign ?up|add a comment.*|post|original audio|suggested for you|more posts from .*|"
+    r"verified|edited|pinned|author|liked by .*|\d[\d,.]*\s*(?:k|m)? ?(?:likes?|views?|plays?|comments?)|"
+    r"meta|about|blog|jobs|help|api|privacy|terms|locations|language|meta verified|threads|"
+    r"contact uploading & non-users|instagram|instagram lite|© \d{4} instagram from meta|"
+    r"(?:\d+[smhdw]|\d+ (?:seconds?|minutes?|hours?|days?|weeks?) ago)(?: ?· ?\d+ likes?)?(?: ?reply)?)$",
+    re.IGNORECASE
+)
+# A bare timestamp, like count or Reply closes a comment
+COMMENT_END = re.compile(r"^(?:\d+[smhdw]|\d+ \w+ ago|reply|\d[\d,]* likes?)(?:\s|$)", re.IGNORECASE)
+HANDLE = re.compile(r"^@?[a-z0-9._]{2,30}(?: Verified)?$")
+TAGS_ONLY = re.compile(r"^(?:[#@][\w.]+[\s,]*)+$")
+
+QUANTITY = re.compile(r"(?:\d+(?:[.,/]\d+)?|[¼½¾⅓⅔⅛]|\b(?:one|two|three|four|half|a few|a pinch)\b)", re.IGNORECASE)
+UNIT_WORDS = (frozenset(UNITS) | frozenset(UNIT_ALIASES)) - {'', 'x', 'c', 't', '#', 'unit', 'item', 'each'}
+COOKING_VERBS = frozenset({
+    'add', 'bake', 'beat', 'blend', 'boil', 'braise', 'broil', 'brown', 'chop', 'combine', 'cook', 'cool',
+    'cover', 'cream', 'cut', 'dice', 'drain', 'drizzle', 'fold', 'fry', 'garnish', 'grate', 'grill',
+    'heat', 'knead', 'marinate', 'mash', 'melt', 'mince', 'mix', 'peel', 'pour', 'preheat', 'reduce',
+    'rest', 'roast', 'saute', 'sauté', 'season', 'sear', 'serve', 'shred', 'simmer', 'slice', 'sprinkle',
+    'steam', 'stir', 'strain', 'toast', 'toss', 'whisk',
+})
+RECIPE_WORDS = frozenset({'ingredients', 'instructions', 'method', 'directions', 'recipe', 'serves', 'servings'})
+TEMPERATURE_OR_TIME = re.compile(r"\d+\s*(?:°|degrees|f\b|c\b|min|minutes|hours?|hrs?|secs?|seconds)", re.IGNORECASE)
+LIST_MARKER = re.compile(r"^\s*(?:[-•*▪️✅🔸]|\d+[.)]|step \d+)", re.IGNORECASE)
+WORD = re.compile(r"[a-zà-ÿ']+")
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+# Whisper output sometimes has little punctuation; long runs are split into pieces this size
+MAX_SENTENCE_WORDS = 40
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough model token count; English text averages about four characters a token"""
+    return (len(text) + 3) // 4
+
+
+def _words(text: str) -> List[str]:
+    return WORD.findall(text.lower())
+
+
+def _trigrams(words: List[str]) -> Set[Tuple[str, ...]]:
+    return {tuple(words[i:i + 3]) for i in range(len(words) - 2)} or {tuple(words)}
+
+
+def relevance(line: str) -> int:
+    """How much a line looks like recipe content: quantities, units, cooking verbs, times"""
+    words = _words(line)
+    vocabulary = set(words) | {word[:-1] for word in words if word.endswith('s')}
+    score = 0
+    if QUANTITY.search(line):
+        score += 1
+        if vocabulary & UNIT_WORDS:
+            score += 2
+    if vocabulary & COOKING_VERBS:
+        score += 2
+    if vocabulary & RECIPE_WORDS:
+        score += 2
+    if TEMPERATURE_OR_TIME.search(line):
+        score += 1
+    if LIST_MARKER.match(line):
+        score += 1
+    return score
+
+
+def strip_page_chrome(text: str) -> str:
+    """Drop UI labels, handles, hashtag walls and comment threads from scraped page text
+
+    Meant for ``article`` and whole-page ``body`` text, which both carry the
+    comment thread. A bare lowercase word is
+    only taken for a handle where handles appear: above the caption (the
+    post's author) or, once the caption's timestamp has gone by, opening a
+    comment that runs until its own timestamp or Reply. Anywhere else it may
+    well be an ingredient ("salt").
+    """
+    lines = [line.strip() for line in text.splitlines()]
+    kept: List[str] = []
+    seen_timestamp = in_comment = False
+    for position, line in enumerate(lines):
+        if not line:
+            continue
+        if COMMENT_END.match(line):
+            seen_timestamp = True
+            in_comment = False
+            continue
+        if HANDLE.match(line):
+            if line.startswith('@') or not kept:
+                continue
+            if seen_timestamp and any(COMMENT_END.match(after) for after in lines[position + 1:position + 5]):
+                in_comment = True
+                continue
+        if in_comment or UI_LINES.match(line) or TAGS_ONLY.match(line):
+            continue
+        kept.append(line)
+    return "\n".join(kept)
+
+
+def sentences(text: str) -> List[str]:
+    pieces = []
+    for sentence in SENTENCE_END.split(text.strip()):
+        words = sentence.split()
+        for start in range(0, len(words), MAX_SENTENCE_WORDS):
+            pieces.append(" ".join(words[start:start + MAX_SENTENCE_WORDS]))
+    return pieces
+
+
+def dedupe_transcript(transcript: str, caption: str) -> str:
+    """Drop transcript sentences that repeat the caption"""
+    caption_grams = _trigrams(_words(caption)) if caption else set()
+    kept = []
+    for sentence in sentences(transcript):
+        words = _words(sentence)
+        if not words:
+            continue
+        grams = _trigrams(words)
+        if caption_grams and len(grams & caption_grams) >= DUPLICATE_OVERLAP * len(grams):
+            continue
+        kept.append(sentence)
+    return " ".join(kept)
+
+
+def _fit_budget(units: List[Dict[str, Any]], budget: int) -> None:
+    """Drop the least relevant units, latest first, until the kept ones fit"""
+    total = sum(unit['tokens'] for unit in units)
+    for unit in sorted(units, key=lambda unit: (unit['score'], -unit['order'])):
+        if total <= budget:
+            break
+        unit['keep'] = False
+        total -= unit['tokens']
+
+
+def trim_content(content: Dict[str, Any], budget: int = PROMPT_TOKEN_BUDGET) -> Tuple[Dict[str, Any], Dict[str, int]]:
+    """Cut a post's caption and transcript down to their recipe-relevant text
+
+    Page chrome and comments are removed from text scraped from the post's
+    article or the whole page body (captions are left as written), transcript
+    sentences already in the caption are dropped, and if the rest is still
+    over ``budget`` tokens the lines scoring lowest on recipe signals go
+    first. Returns the trimmed content and token estimates before and after.
+    """
+    caption = content.get('text_content') or ''
+    transcript = content.get('transcription') or ''
+    before = estimate_tokens(caption) + estimate_tokens(transcript)
+
+    if content.get('text_source') in ('article', 'body'):
+        caption = strip_page_chrome(caption)
+    transcript = dedupe_transcript(transcript, caption) if transcript else ''
+
+    units = []
+    for index, line in enumerate(caption.splitlines()):
+        score = relevance(line) + (1 if index < INTRO_LINES else 0)
+        units.append({'source': 'caption', 'text': line, 'score': score})
+    for sentence in sentences(transcript) if transcript else []:
+        units.append({'source': 'transcript', 'text': sentence, 'score': relevance(sentence)})
+    for order, unit in enumerate(units):
+        unit.update(order=order, tokens=estimate_tokens(unit['text']) + 1, keep=True)
+    _fit_budget(units, budget)
+
+    kept = [unit for unit in units if unit['keep']]
+    trimmed = dict(content)
+    trimmed['text_content'] = "\n".join(unit['text'] for unit in kept if unit['source'] == 'caption')
+    if content.get('transcription') is not None:
+        trimmed['transcription'] = " ".join(unit['text'] for unit in kept if unit['source'] == 'transcript')
+    after = estimate_tokens(trimmed['text_content']) + estimate_tokens(trimmed.get('transcription') or '')
+    return trimmed, {'before': before, 'after': after, 'saved': before - after}
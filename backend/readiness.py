@@ -0,0 +1,123 @@
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Optional, Tuple
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
+# Seconds each signal may take before we give up on it
+SIGNAL_TIMEOUTS = {
+    'article': 8.0,
+    'image': 5.0,
+    'caption': 3.0,
+}
+POLL_INTERVAL = 0.1
+
+_IMAGE_LOADED_JS = """
+return Array.from(document.images).some(function (img) {
+    var src = img.currentSrc || img.src || '';
+    return (src.indexOf('scontent') !== -1 || src.indexOf('cdninstagram') !== -1)
+        && img.complete && img.naturalWidth > 200 && img.naturalHeight > 200;
+});
+"""
+
+_CAPTION_PRESENT_JS = """
+var nodes = [document.querySelector('article')].concat(
+    Array.from(document.querySelectorAll('div._a9zs')));
+return nodes.some(function (node) {
+    return node && node.innerText && node.innerText.trim().length > 0;
+});
+"""
+
+
+def _article_present(driver) -> bool:
+    return bool(EC.presence_of_element_located((By.TAG_NAME, "article"))(driver))
+
+
+def _image_loaded(driver) -> bool:
+    return bool(driver.execute_script(_IMAGE_LOADED_JS))
+
+
+def _caption_present(driver) -> bool:
+    return bool(driver.execute_script(_CAPTION_PRESENT_JS))
+
+
+SIGNALS: Tuple[Tuple[str, Callable], ...] = (
+    ('article', _article_present),
+    ('image', _image_loaded),
+    ('caption', _caption_present),
+)
+
+
+class _SignalStats:
+    """Running per-signal wait timings, shared across threads"""
+
+    def __init__(self, window: int = 500):
+        self._lock = threading.Lock()
+        self._samples = {name: deque(maxlen=window) for name, _ in SIGNALS}
+        self._counts = {name: {'waits': 0, 'met': 0, 'timeouts': 0, 'skipped': 0}
+                        for name, _ in SIGNALS}
+
+    def record(self, name: str, seconds: Optional[float], outcome: str):
+        with self._lock:
+            counts = self._counts[name]
+            counts[outcome] += 1
+            if outcome != 'skipped':
+                counts['waits'] += 1
+                self._samples[name].append(seconds)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            result = {}
+            for name, samples in self._samples.items():
+                ordered = sorted(samples)
+                result[name] = {
+                    **self._counts[name],
+                    'p50_seconds': ordered[len(ordered) // 2] if ordered else 0.0,
+                    'max_seconds': ordered[-1] if ordered else 0.0,
+                }
+            return result
+
+
+_stats = _SignalStats()
+
+
+def wait_for_post_ready(driver, timeouts: Optional[Dict[str, float]] = None) -> Dict[str, Optional[float]]:
+    """Wait for the post's article, main image and caption instead of sleeping
+
+    Each signal returns as soon as it is observed. If the article never
+    appears the page is not rendering a post (login wall, removed post), so
+    the remaining signals are skipped. Returns seconds waited per signal,
+    or None for signals that timed out or were skipped.
+    """
+    timeouts = {**SIGNAL_TIMEOUTS, **(timeouts or {})}
+    timings: Dict[str, Optional[float]] = {}
+    abandon = False
+
+    for name, condition in SIGNALS:
+        if abandon:
+            timings[name] = None
+            _stats.record(name, None, 'skipped')
+            continue
+
+        started = time.monotonic()
+        try:
+            WebDriverWait(driver, timeouts[name], poll_frequency=POLL_INTERVAL,
+                          ignored_exceptions=(WebDriverException,)).until(condition)
+            elapsed = time.monotonic() - started
+            timings[name] = elapsed
+            _stats.record(name, elapsed, 'met')
+        except TimeoutException:
+            timings[name] = None
+            _stats.record(name, time.monotonic() - started, 'timeouts')
+            if name == 'article':
+                abandon = True
+
+    return timings
+
+
+def readiness_stats() -> Dict[str, Dict[str, float]]:
+    """Per-signal wait counts and latency percentiles since process start"""
+    return _stats.snapshot()
@@ -2,27 +2,24 @@
 
 import os
 import time
+import atexit
+import functools
+import threading
 import tempfile
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Callable
 from datetime import datetime
 from pydantic import BaseModel
-from openai import OpenAI
-from IPython.display import HTML, display, Image, clear_output
-from google.colab import userdata, files
-import requests
 import json
 import re
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-import yt_dlp
-from moviepy.editor import VideoFileClip
-from PIL import Image as PILImage, ImageDraw, ImageFont
-from io import BytesIO
-from fpdf import FPDF
+from concurrent.futures import ThreadPoolExecutor
+from cache import CACHE_DIR, cache_key
+from metrics import instrument, record_prompt_tokens, timed
+from units import format_amount
+
+# Heavy dependencies (openai, selenium, yt-dlp, numpy, PIL, fpdf) are imported
+# inside the functions that use them, and clients, browsers and caches are
+# created on first use, so importing this module has no side effects and
+# paths like PDF export never load the extraction stack.
 
 # Structured Data Models
 class MacroNutrients(BaseModel):
@@ -86,313 +83,398 @@ class Recipe(BaseModel):
     video_transcription: Optional[str]
     thumbnail_url: Optional[str]
     created_at: str
-    # Initialize OpenAI
-try:
-    OPENAI_API_KEY = userdata.get('OPENAI_API_KEY')
-    if not OPENAI_API_KEY:
+    thumbnail_variants: Optional[Dict[str, Dict[str, Dict[str, Any]]]] = None
+
+def lazy_component(factory):
+    """Run a zero-argument factory once, on first use, and reuse its result"""
+    lock = threading.Lock()
+    created = []
+
+    @functools.wraps(factory)
+    def get():
+        if not created:
+            with lock:
+                if not created:
+                    created.append(factory())
+        return created[0]
+
+    get.is_created = lambda: bool(created)
+    return get
+
+@lazy_component
+def get_client():
+    """OpenAI client, keyed from OPENAI_API_KEY or Colab secrets"""
+    from openai import OpenAI
+
+    api_key = os.environ.get('OPENAI_API_KEY')
+    if not api_key:
+        try:
+            from google.colab import userdata
+            api_key = userdata.get('OPENAI_API_KEY')
+        except ImportError:
+            pass
+    if not api_key:
+        print("\n⚠️ OpenAI API Key Error!")
+        print("Set the OPENAI_API_KEY environment variable, or in Colab:")
+        print("1. Click folder icon → key icon")
+        print("2. Add: Name: OPENAI_API_KEY")
+        print("   Value: your-openai-api-key")
         raise ValueError("OpenAI API key not found")
-    client = OpenAI(api_key=OPENAI_API_KEY)
+
+    client = OpenAI(api_key=api_key)
     print("✅ OpenAI API initialized")
-except Exception as e:
-    print("\n⚠️ OpenAI API Key Error!")
-    print("Add your key to Colab secrets:")
-    print("1. Click folder icon → key icon")
-    print("2. Add: Name: OPENAI_API_KEY")
-    print("   Value: your-openai-api-key")
-    raise e
-
-# Initialize Chrome
-chrome_options = Options()
-chrome_options.add_argument('--headless')
-chrome_options.add_argument('--no-sandbox')
-chrome_options.add_argument('--disable-dev-shm-usage')
-chrome_options.add_argument('--disable-gpu')
-chrome_options.add_argument('--window-size=1920x1080')
-driver = webdriver.Chrome(options=chrome_options)
-print("✅ Chrome initialized")
-
-def download_and_transcribe_video(url: str) -> dict:
+    return client
+
+@lazy_component
+def get_browser_pool():
+    """Chrome pool, started with one warm browser and topped up in the background"""
+    from browser_pool import BrowserPool
+
+    pool = BrowserPool()
+    pool.warm(1)
+    threading.Thread(target=pool.warm, name='browser-warmup', daemon=True).start()
+    atexit.register(pool.shutdown)
+    print(f"✅ Chrome pool initialized ({pool.size} browsers)")
+    return pool
+
+@lazy_component
+def get_result_cache():
+    """Finished recipes and each intermediate stage, keyed by normalized source URL"""
+    from cache import build_result_cache
+    return build_result_cache()
+
+@lazy_component
+def get_transcript_store():
+    """Reposted reels share audio, so transcripts are keyed by what was said"""
+    from cache import TranscriptStore
+    return TranscriptStore(
+        os.environ.get('TRANSCRIPT_CACHE_DB', os.path.join(CACHE_DIR, 'transcripts.sqlite3')),
+        max_bytes=int(os.environ.get('TRANSCRIPT_CACHE_BYTES', 64 * 1024 * 1024))
+    )
+
+@lazy_component
+def get_thumbnail_store():
+    """Rendered thumbnails, stored once per distinct source image and overlay"""
+    from thumbnail_store import ThumbnailStore
+    return ThumbnailStore(
+        os.environ.get('THUMBNAIL_DIR', os.path.join(CACHE_DIR, 'thumbnails')),
+        max_bytes=int(os.environ.get('THUMBNAIL_STORE_BYTES', 1024 * 1024 * 1024))
+    )
+
+@lazy_component
+def get_pdf_cache():
+    """Finished PDFs keyed by recipe content, so repeat downloads skip layout"""
+    from cache import TTLCache
+    return TTLCache(max_entries=int(os.environ.get('PDF_CACHE_SIZE', 64)))
+
+@lazy_component
+def get_transcription_executor():
+    """Chunks of one long video are uploaded side by side"""
+    executor = ThreadPoolExecutor(
+        max_workers=int(os.environ.get('TRANSCRIBE_WORKERS', 4)),
+        thread_name_prefix='transcribe'
+    )
+    atexit.register(executor.shutdown, wait=False)
+    return executor
+
+@lazy_component
+def get_pipeline_executor():
+    """Runs the independent branches of each extraction side by side"""
+    executor = ThreadPoolExecutor(
+        max_workers=int(os.environ.get('PIPELINE_WORKERS', 8)),
+        thread_name_prefix='pipeline'
+    )
+    atexit.register(executor.shutdown, wait=False)
+    return executor
+
+@lazy_component
+def get_image_executor():
+    """Small pool for thumbnail source downloads, kept apart from the long
+    pipeline branches so the early prefetch never queues behind them"""
+    executor = ThreadPoolExecutor(
+        max_workers=int(os.environ.get('IMAGE_FETCH_WORKERS', 4)),
+        thread_name_prefix='image'
+    )
+    atexit.register(executor.shutdown, wait=False)
+    return executor
+
+def runtime_stats() -> Dict[str, Optional[Dict[str, Any]]]:
+    """Snapshots from every component, or None for those not started yet"""
+    from fast_path import tier_counters
+    from http_client import http_client
+
+    browser_started = get_browser_pool.is_created()
+    if browser_started:
+        from readiness import readiness_stats
+    return {
+        'browser_pool': get_browser_pool().stats() if browser_started else None,
+        'readiness': readiness_stats() if browser_started else None,
+        'extraction_tiers': tier_counters.snapshot(),
+        'result_cache': get_result_cache().stats() if get_result_cache.is_created() else None,
+        'transcript_cache': get_transcript_store().stats() if get_transcript_store.is_created() else None,
+        'thumbnail_store': get_thumbnail_store().stats() if get_thumbnail_store.is_created() else None,
+        'http': http_client.host_stats(),
+    }
+
+def shutdown():
+    """Quit any browsers that were started"""
+    if get_browser_pool.is_created():
+        get_browser_pool().shutdown()
+
+# Fetch only the audio stream unless AUDIO_ONLY=0
+AUDIO_ONLY = os.environ.get('AUDIO_ONLY', '1') != '0'
+
+WHISPER_MODEL = "whisper-1"
+
+def transcribe_file(audio_path: str) -> str:
+    """Send one audio file to Whisper"""
+    with open(audio_path, "rb") as audio_file:
+        return get_client().audio.transcriptions.create(
+            model=WHISPER_MODEL,
+            file=audio_file,
+            response_format="text"
+        )
+
+def transcribe_audio(audio_path: str) -> str:
+    """Transcribe audio, skipping silence and audio that was already transcribed
+
+    The audio is downsampled to mono, silence is trimmed, and the rest is
+    split at pauses into chunks that are transcribed concurrently and
+    stitched back together in order.
+    """
+    from audio import audio_fingerprint, prepare_speech_chunks
+
+    fingerprint = audio_fingerprint(audio_path)
+    transcript = get_transcript_store().get(fingerprint, WHISPER_MODEL)
+    if transcript is not None:
+        print("♻️ Reusing transcript of identical audio")
+        return transcript
+
+    with tempfile.TemporaryDirectory() as chunk_dir:
+        try:
+            prepared = prepare_speech_chunks(audio_path, chunk_dir)
+        except Exception as e:
+            print(f"⚠️ Audio preprocessing failed, sending original: {str(e)}")
+            transcript = transcribe_file(audio_path)
+        else:
+            print(f"✂️ Trimmed {prepared['removed_seconds']:.1f}s of silence from "
+                  f"{prepared['original_seconds']:.1f}s of audio, "
+                  f"{len(prepared['chunks'])} chunk(s)")
+            parts = get_transcription_executor().map(transcribe_file, prepared['chunks'])
+            transcript = "\n".join(part.strip() for part in parts if part and part.strip())
+
+    get_transcript_store().set(fingerprint, WHISPER_MODEL, transcript)
+    return transcript
+
+@instrument('download_and_transcribe', bytes_of=lambda result: result.get('bytes_downloaded'),
+            failed=lambda result: not result or not (result.get('transcription') or result.get('bytes_downloaded')))
+def download_and_transcribe_video(url: str, audio_only: bool = AUDIO_ONLY) -> dict:
     """Download and transcribe Instagram video with enhanced error handling"""
+    from audio import download_audio, download_video_audio
+
     try:
-        print("🎥 Downloading video...")
         with tempfile.TemporaryDirectory() as temp_dir:
-            video_path = os.path.join(temp_dir, 'video.mp4')
-            audio_path = os.path.join(temp_dir, 'audio.mp3')
-            
-            ydl_opts = {
-                'format': 'best[ext=mp4]',
-                'outtmpl': video_path,
-                'quiet': True,
-                'retries': 5,
-                'fragment_retries': 5
+            if audio_only:
+                print("🎵 Downloading audio...")
+                audio = download_audio(url, temp_dir)
+            else:
+                print("🎥 Downloading video...")
+                audio = download_video_audio(url, temp_dir)
+
+            print(f"📦 Downloaded {audio['bytes_downloaded'] / 1e6:.1f} MB, "
+                  f"audio ready in {audio['decode_seconds']:.1f}s")
+            stats = {
+                'duration': audio['duration'],
+                'bytes_downloaded': audio['bytes_downloaded'],
+                'decode_seconds': audio['decode_seconds']
             }
-            
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                ydl.download([url])
 
-            if not os.path.exists(video_path):
-                raise FileNotFoundError("Video download failed")
-
-            print("🎵 Extracting audio...")
-            video = VideoFileClip(video_path)
-            
-            if video.audio is None:
+            if audio['path'] is None:
                 print("⚠️ No audio found in video")
-                video.close()
-                return {'transcription': None, 'duration': video.duration}
-
-            video.audio.write_audiofile(audio_path, verbose=False, logger=None)
-            duration = video.duration
-            video.close()
+                return {'transcription': None, **stats}
 
             print("🎙️ Transcribing audio...")
-            with open(audio_path, "rb") as audio_file:
-                transcript = client.audio.transcriptions.create(
-                    model="whisper-1",
-                    file=audio_file,
-                    response_format="text"
-                )
+            transcript = transcribe_audio(audio['path'])
 
             return {
                 'transcription': transcript,
-                'duration': duration
+                **stats
             }
 
     except Exception as e:
         print(f"⚠️ Video processing error: {str(e)}")
         return {'transcription': None, 'duration': None}
 
+@instrument('content')
 def extract_instagram_content(url: str) -> dict:
-    """Extract content from Instagram post with enhanced image selection"""
-    try:
-        print("📱 Accessing Instagram post...")
-        driver.get(url)
-        time.sleep(5)
+    """Extract content from Instagram post, only opening a browser when needed"""
+    from fast_path import scrape_post_html, tier_counters
 
-        # Extract image with multiple selectors and prioritize article image
-        image_url = None
-        
-        # Try to find the main article image first
-        try:
-            article = driver.find_element(By.TAG_NAME, "article")
-            images = article.find_elements(By.TAG_NAME, "img")
-            for img in images:
-                src = img.get_attribute('src')
-                if src and ('scontent' in src or 'cdninstagram' in src):
-                    # Skip profile pictures which are usually small
-                    width = img.get_attribute('width')
-                    height = img.get_attribute('height')
-                    if width and height:
-                        if int(width) > 200 and int(height) > 200:
-                            image_url = src
-                            break
-        except:
-            pass
+    print("📱 Accessing Instagram post...")
+    try:
+        content = scrape_post_html(url)
+    except Exception as e:
+        # Unexpected markup must not cost us the browser fallback
+        print(f"⚠️ Fast path parse error: {str(e)}")
+        content = None
+    if content:
+        tier_counters.record('fast_path')
+        print("⚡ Post content found without a browser")
+        return content
+
+    content = scrape_with_browser(url)
+    tier_counters.record('browser' if content else 'failed')
+    return content
+
+def scrape_with_browser(url: str) -> dict:
+    """Extract content from Instagram post with enhanced image selection"""
+    from readiness import wait_for_post_ready
+    from dom_extract import extract_dom_payload, select_image, select_text
 
-        # Fallback selectors if article image not found
-        if not image_url:
-            selectors = [
-                "img[class*='x5yr21d']",
-                "img[class*='_aagt']",
-                "img[decoding='sync'][style*='width']",
-                "img[class*='_aa1d']",
-                "img[class*='_aagv']"
-            ]
-            
-            for selector in selectors:
-                try:
-                    elements = driver.find_elements(By.CSS_SELECTOR, selector)
-                    for elem in elements:
-                        src = elem.get_attribute('src')
-                        if src and ('scontent' in src or 'cdninstagram' in src):
-                            # Check image dimensions if available
-                            width = elem.get_attribute('width')
-                            height = elem.get_attribute('height')
-                            if width and height:
-                                if int(width) > 200 and int(height) > 200:
-                                    image_url = src
-                                    break
-                    if image_url:
-                        break
-                except:
-                    continue
+    try:
+        print("🌐 Rendering post in browser...")
+        with get_browser_pool().checkout() as driver:
+            driver.get(url)
+            readiness = wait_for_post_ready(driver)
+            waited = ", ".join(f"{name} {seconds:.1f}s" for name, seconds in readiness.items() if seconds is not None)
+            print(f"⏱️ Page ready ({waited or 'no signals met'})")
+
+            # Collect every candidate image and text source in one round trip,
+            # then rank them locally
+            payload = extract_dom_payload(driver)
+            image_url = select_image(payload)
+            text_content, text_source = select_text(payload)
+
+            if not image_url:
+                print("⚠️ Could not find recipe image")
 
-        # Extract text content with multiple methods
-        text_content = ""
-        try:
-            # Method 1: Article text
-            article = driver.find_element(By.TAG_NAME, "article")
-            text_content = article.text
-        except:
-            try:
-                # Method 2: Caption elements
-                elements = driver.find_elements(By.CSS_SELECTOR, "div._a9zs")
-                text_content = "\n".join([elem.text for elem in elements])
-            except:
-                try:
-                    # Method 3: Body text as fallback
-                    text_content = driver.find_element(By.TAG_NAME, "body").text
-                except Exception as e:
-                    print(f"⚠️ Text extraction failed: {str(e)}")
+            return {
+                'image_url': image_url,
+                'text_content': text_content,
+                'text_source': text_source,
+                'url': url
+            }
 
-        if not image_url:
-            print("⚠️ Could not find recipe image")
+    except Exception as e:
+        print(f"⚠️ Content extraction error: {str(e)}")
+        return None
 
-        return {
-            'image_url': image_url,
-            'text_content': text_content,
-            'url': url
-        }
+NUTRITION_MIN_COVERAGE = float(os.environ.get('NUTRITION_MIN_COVERAGE', '0.8'))
+
+def calculate_nutrition(recipes: List[Recipe]) -> List[Recipe]:
+    """Fill in macros from the local nutrition table, batched across recipes
+
+    Every matched ingredient gets its per-serving macro_contribution; a
+    recipe's totals are only replaced when enough of its ingredients were
+    matched, otherwise the model's estimate is kept.
+    """
+    from nutrition import compute_nutrition
+    for recipe, result in zip(recipes, compute_nutrition(recipes)):
+        for ingredient, contribution in zip(recipe.ingredients, result['contributions']):
+            if contribution is not None:
+                ingredient.macro_contribution = contribution
+        if result['coverage'] >= NUTRITION_MIN_COVERAGE:
+            recipe.macros = MacroNutrients(**result['macros'])
+            recipe.calories_per_serving = recipe.macros.calories
+    return recipes
+
+def generate_shopping_list(recipe: Recipe) -> List[ShoppingItem]:
+    """Build the shopping list from the parsed ingredients, without a model call"""
+    from shopping_list import build_shopping_list
+    return [ShoppingItem(**item) for item in build_shopping_list(recipe.ingredients)]
+
+def scale_recipe(recipe: Recipe, servings: Optional[int] = None, system: Optional[str] = None,
+                 by_weight: bool = False) -> Recipe:
+    """Copy of a recipe rescaled to a number of servings and/or converted to a
+    measuring system, computed locally. Per-serving nutrition is unchanged."""
+    from scaling import scale_amount
+    factor = servings / recipe.servings if servings and recipe.servings else 1.0
+    scaled = recipe.copy(deep=True)
+    for ingredient in scaled.ingredients:
+        ingredient.amount, ingredient.unit = scale_amount(
+            ingredient.amount, ingredient.unit, factor, system, ingredient.name, by_weight)
+        if ingredient.shopping_info:
+            info = ingredient.shopping_info
+            info.amount, info.unit = scale_amount(info.amount, info.unit, factor, system, info.name)
+    scaled.servings = servings or recipe.servings
+    scaled.cost_estimate = round(recipe.cost_estimate * factor, 2)
+    scaled.shopping_list = generate_shopping_list(scaled)
+    if system:
+        for item in scaled.shopping_list:
+            item.amount, item.unit = scale_amount(item.amount, item.unit, 1.0, system, item.name)
+    return scaled
+
+@instrument('image_download', bytes_of=len)
+def fetch_image(image_url: str) -> Optional[bytes]:
+    """Download the source image for a thumbnail"""
+    from http_client import http_client
 
+    try:
+        return http_client.get(image_url).content
     except Exception as e:
-        print(f"⚠️ Content extraction error: {str(e)}")
+        print(f"⚠️ Image download error: {str(e)}")
         return None
 
-def generate_thumbnail(recipe: Recipe, image_url: str) -> str:
-    """Generate recipe thumbnail with enhanced font handling and image focus"""
+@instrument('thumbnail', bytes_of=lambda manifest: sum(
+    variant['bytes'] for formats in manifest.values() for variant in formats.values()))
+def generate_thumbnail_variants(recipe: Recipe, image_url: str, image_data: Optional[bytes] = None,
+                                variants: Optional[Dict[str, Dict[str, Any]]] = None) -> Optional[Dict[str, Any]]:
+    """Render every thumbnail size and format in one pass
+
+    ``variants`` maps names to ``{'size', 'formats'}`` like thumbnail.VARIANTS,
+    which is the default. Returns a manifest of
+    ``{variant: {format: {url, width, height, bytes}}}``.
+    Renders are content-addressed, so a source image and overlay that were
+    already rendered are served from the thumbnail store without re-encoding.
+    """
+    from thumbnail import macro_line, render_signature, render_variants
+
     try:
         print("🎨 Creating thumbnail...")
         if not image_url:
             print("⚠️ No image URL provided")
             return None
-            
-        response = requests.get(image_url)
-        img = PILImage.open(BytesIO(response.content))
-        
-        # Set dimensions maintaining aspect ratio
-        target_width = 1280
-        target_height = 720
-        
-        # Calculate new dimensions preserving aspect ratio
-        width_ratio = target_width / img.width
-        height_ratio = target_height / img.height
-        
-        if width_ratio < height_ratio:
-            new_width = target_width
-            new_height = int(img.height * width_ratio)
-        else:
-            new_height = target_height
-            new_width = int(img.width * height_ratio)
-            
-        # Resize image
-        img = img.resize((new_width, new_height), PILImage.LANCZOS)
-        
-        # Create new image with target dimensions
-        background = PILImage.new('RGB', (target_width, target_height), (255, 255, 255))
-        
-        # Calculate position to center image
-        x = (target_width - new_width) // 2
-        y = (target_height - new_height) // 2
-        
-        # Paste resized image onto background
-        background.paste(img, (x, y))
-        img = background
-        
-        # Create overlay for text
-        overlay = PILImage.new('RGBA', (target_width, target_height), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(overlay)
-        
-        # Add gradient overlay at bottom only
-        gradient_height = target_height // 3
-        for i in range(gradient_height):
-            alpha = int(255 * (i / gradient_height))
-            y_position = target_height - gradient_height + i
-            draw.rectangle([(0, y_position), (target_width, y_position+1)], 
-                         fill=(0, 0, 0, alpha))
-        
-        # Try multiple font paths
-        font_paths = [
-            "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
-            "/usr/share/fonts/dejavu/DejaVuSans-Bold.ttf",
-            "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
-            "arial.ttf"  # Fallback to system Arial
-        ]
-        
-        # Get title font
-        title_font = None
-        for path in font_paths:
-            try:
-                title_font = ImageFont.truetype(path, 48)
-                break
-            except:
-                continue
-        
-        if not title_font:
-            print("⚠️ Using default font for title")
-            title_font = ImageFont.load_default()
-            
-        # Get macro font
-        macro_font = None
-        for path in font_paths:
-            try:
-                macro_font = ImageFont.truetype(path, 32)
-                break
-            except:
-                continue
-        
-        if not macro_font:
-            print("⚠️ Using default font for macros")
-            macro_font = ImageFont.load_default()
-
-        # Add title with shadow effect for better readability
-        title_y = target_height - 140
-        words = recipe.title.split()
-        lines = []
-        current_line = []
-        
-        for word in words:
-            current_line.append(word)
-            line_text = ' '.join(current_line)
-            bbox = title_font.getbbox(line_text)
-            line_width = bbox[2] - bbox[0] if bbox else 0
-            
-            if line_width > target_width - 80:
-                if len(current_line) > 1:
-                    current_line.pop()
-                    lines.append(' '.join(current_line))
-                    current_line = [word]
-                else:
-                    lines.append(line_text)
-                    current_line = []
-        
-        if current_line:
-            lines.append(' '.join(current_line))
-
-        # Draw title lines with shadow
-        for line in lines:
-            # Draw shadow
-            draw.text((42, title_y+2), line, font=title_font, fill='black')
-            # Draw text
-            draw.text((40, title_y), line, font=title_font, fill='white')
-            title_y += 50
-
-        # Add macro information with shadow
-        macro_text = (
-            f"{recipe.macros.calories} cal | "
-            f"P:{recipe.macros.protein_g:.1f}g ({recipe.macros.protein_percentage:.0f}%) | "
-            f"C:{recipe.macros.carbs_g:.1f}g ({recipe.macros.carbs_percentage:.0f}%) | "
-            f"F:{recipe.macros.fat_g:.1f}g ({recipe.macros.fat_percentage:.0f}%)"
-        )
-        # Draw shadow
-        draw.text((42, target_height-58), macro_text, font=macro_font, fill='black')
-        # Draw text
-        draw.text((40, target_height-60), macro_text, font=macro_font, fill='white')
-        
-        # Merge image and overlay
-        final_img = PILImage.alpha_composite(img.convert('RGBA'), overlay)
-        final_img = final_img.convert('RGB')  # Convert back to RGB for JPEG support
-        
-        # Save with higher quality
-        thumbnail_path = f"recipe_thumbnail_{int(time.time())}.jpg"
-        final_img.save(thumbnail_path, "JPEG", quality=95)
-        
-        print("✅ Thumbnail created successfully")
-        return thumbnail_path
+
+        if image_data is None:
+            image_data = fetch_image(image_url)
+        if not image_data:
+            return None
+
+        store = get_thumbnail_store()
+        store_key = store.key_for(image_data, recipe.title, macro_line(recipe), render_signature(variants=variants))
+        manifest = store.get(store_key)
+        if manifest:
+            print("♻️ Thumbnail already rendered")
+            return manifest
+
+        encoded, stats = render_variants(recipe, image_data, variants)
+        print(f"🖼️ Decoded {stats['decoded_size'][0]}x{stats['decoded_size'][1]} of "
+              f"{stats['full_size'][0]}x{stats['full_size'][1]} source "
+              f"({stats['decoded_bytes'] / 1e6:.1f} MB of {stats['full_decode_bytes'] / 1e6:.1f} MB), "
+              f"~{stats['estimated_pixel_bytes'] / 1e6:.1f} MB of pixel buffers (estimated)")
+
+        manifest = store.put(store_key, encoded)
+        total = sum(variant['bytes'] for formats in manifest.values() for variant in formats.values())
+        print(f"✅ Thumbnail created successfully ({total / 1e3:.0f} KB across all variants)")
+        return manifest
 
     except Exception as e:
         print(f"⚠️ Thumbnail generation error: {str(e)}")
         return None
 
+def generate_thumbnail(recipe: Recipe, image_url: str, image_data: Optional[bytes] = None) -> str:
+    """Generate recipe thumbnail with enhanced font handling and image focus"""
+    manifest = generate_thumbnail_variants(recipe, image_url, image_data)
+    return manifest['detail']['jpeg']['url'] if manifest else None
+
+def thumbnail_file(thumbnail_url: Optional[str]) -> Optional[str]:
+    """Local file behind a thumbnail URL or path, if it still exists"""
+    if not thumbnail_url:
+        return None
+    if os.path.exists(thumbnail_url):
+        return thumbnail_url
+    return get_thumbnail_store().path_for_url(thumbnail_url)
+
 def display_recipe(recipe: Recipe):
     """Display recipe information in console"""
     print("\n" + "="*50)
@@ -423,7 +505,7 @@ def display_recipe(recipe: Recipe):
     print("\n🥕 INGREDIENTS")
     for ing in recipe.ingredients:
         notes = f" ({ing.notes})" if ing.notes else ""
-        print(f"• {ing.amount} {ing.unit} {ing.name}{notes}")
+        print(f"• {format_amount(ing.amount)} {ing.unit} {ing.name}{notes}")
     
     print("\n🔧 EQUIPMENT NEEDED")
     for item in recipe.equipment_needed:
@@ -450,174 +532,202 @@ def display_recipe(recipe: Recipe):
     
     if recipe.shopping_list:
         print("\n🛒 SHOPPING LIST")
-        sections = {}
-        for item in recipe.shopping_list:
-            if item.store_section not in sections:
-                sections[item.store_section] = []
-            sections[item.store_section].append(item)
-        
-        for section, items in sorted(sections.items()):
+        from shopping_list import group_by_section
+        for section, items in group_by_section(recipe.shopping_list).items():
             print(f"\n{section}:")
             for item in items:
-                print(f"• {item.amount} {item.unit} {item.name}")
+                print(f"• {format_amount(item.amount)} {item.unit} {item.name}")
     
     print("\n" + "="*50 + "\n")
 
-def export_recipe_pdf(recipe: Recipe, thumbnail_path: str = None):
-    """Export recipe to PDF with Unicode support"""
+def pdf_thumbnail(recipe: Recipe) -> Optional[str]:
+    """Stored file of the downscaled PDF variant, falling back to the detail image"""
+    variants = recipe.thumbnail_variants or {}
+    for url in (variants.get('pdf', {}).get('jpeg', {}).get('url'), recipe.thumbnail_url):
+        path = get_thumbnail_store().path_for_url(url)
+        if path:
+            return path
+    return None
+
+def stored_recipe(source_url: str) -> Optional[Recipe]:
+    """Previously extracted recipe, looked up by its source post URL"""
+    cached = get_result_cache().get('recipe', cache_key(source_url))
+    return Recipe(**cached) if cached else None
+
+@instrument('pdf', bytes_of=len)
+def recipe_pdf(recipe: Recipe, thumbnail_path: str = None) -> Optional[bytes]:
+    """Render the recipe PDF in memory, reusing earlier renders of identical content"""
+    from pdf_export import recipe_pdf_key, render_recipe_pdf
+
     try:
+        thumbnail_path = thumbnail_file(thumbnail_path) or pdf_thumbnail(recipe)
+        key = f"{recipe_pdf_key(recipe)}:{thumbnail_path or ''}"
+        data = get_pdf_cache().get('pdf', key)
+        if data:
+            print("♻️ PDF already rendered")
+            return data
+
         print("📄 Generating PDF...")
-        pdf = FPDF()
-        
-        # Enable UTF-8 encoding
-        pdf.set_auto_page_break(auto=True, margin=15)
-        
-        def safe_text(text):
-            """Convert problematic characters to safe alternatives"""
-            return (text.replace('•', '-')
-                      .replace('…', '...')
-                      .replace('"', '"')
-                      .replace('"', '"')
-                      .replace(''', "'")
-                      .replace(''', "'")
-                      .encode('latin-1', 'replace').decode('latin-1'))
-        
-        pdf.add_page()
-        
-        # Add thumbnail if available
-        if thumbnail_path and os.path.exists(thumbnail_path):
-            try:
-                pdf.image(thumbnail_path, x=10, y=10, w=190)
-                pdf.ln(60)
-            except:
-                print("⚠️ Could not add thumbnail to PDF")
-                pdf.ln(10)
-        
-        # Title
-        pdf.set_font('Arial', 'B', 24)
-        pdf.cell(0, 10, safe_text(recipe.title), ln=True, align='C')
-        pdf.ln(5)
-        
-        # Description
-        pdf.set_font('Arial', '', 12)
-        pdf.multi_cell(0, 10, safe_text(recipe.description))
-        pdf.ln(5)
-        
-        # Recipe Info
-        pdf.set_font('Arial', 'B', 14)
-        pdf.cell(0, 10, 'Recipe Information', ln=True)
-        pdf.set_font('Arial', '', 12)
-        pdf.cell(0, 10, f'Cuisine: {safe_text(recipe.cuisine_type)}', ln=True)
-        pdf.cell(0, 10, f'Difficulty: {safe_text(recipe.difficulty)}', ln=True)
-        pdf.cell(0, 10, f'Prep Time: {recipe.prep_time} minutes', ln=True)
-        pdf.cell(0, 10, f'Cook Time: {recipe.cook_time} minutes', ln=True)
-        pdf.cell(0, 10, f'Total Time: {recipe.total_time} minutes', ln=True)
-        pdf.cell(0, 10, f'Servings: {recipe.servings}', ln=True)
-        pdf.ln(5)
-        
-        # Nutrition Information
-        pdf.set_font('Arial', 'B', 14)
-        pdf.cell(0, 10, 'Nutrition (per serving)', ln=True)
-        pdf.set_font('Arial', '', 12)
-        pdf.cell(0, 10, f'Calories: {recipe.macros.calories}', ln=True)
-        pdf.cell(0, 10, f'Protein: {recipe.macros.protein_g:.1f}g ({recipe.macros.protein_percentage:.0f}%)', ln=True)
-        pdf.cell(0, 10, f'Carbs: {recipe.macros.carbs_g:.1f}g ({recipe.macros.carbs_percentage:.0f}%)', ln=True)
-        pdf.cell(0, 10, f'Fat: {recipe.macros.fat_g:.1f}g ({recipe.macros.fat_percentage:.0f}%)', ln=True)
-        if recipe.macros.fiber_g > 0:
-            pdf.cell(0, 10, f'Fiber: {recipe.macros.fiber_g:.1f}g', ln=True)
-        if recipe.macros.sugar_g > 0:
-            pdf.cell(0, 10, f'Sugar: {recipe.macros.sugar_g:.1f}g', ln=True)
-        pdf.ln(5)
-        
-        # Ingredients
-        pdf.add_page()
-        pdf.set_font('Arial', 'B', 14)
-        pdf.cell(0, 10, 'Ingredients', ln=True)
-        pdf.set_font('Arial', '', 12)
-        for ing in recipe.ingredients:
-            notes = f" ({safe_text(ing.notes)})" if ing.notes else ""
-            pdf.multi_cell(0, 10, f"- {ing.amount} {safe_text(ing.unit)} {safe_text(ing.name)}{notes}")
-        pdf.ln(5)
-        
-        # Equipment
-        pdf.set_font('Arial', 'B', 14)
-        pdf.cell(0, 10, 'Equipment Needed', ln=True)
-        pdf.set_font('Arial', '', 12)
-        for item in recipe.equipment_needed:
-            pdf.cell(0, 10, f"- {safe_text(item)}", ln=True)
-        pdf.ln(5)
-        
-        # Instructions
-        pdf.add_page()
-        pdf.set_font('Arial', 'B', 14)
-        pdf.cell(0, 10, 'Instructions', ln=True)
-        pdf.set_font('Arial', '', 12)
-        for step in recipe.steps:
-            duration = f" ({step.duration_minutes} min)" if step.duration_minutes else ""
-            temp = f" at {step.temperature}" if step.temperature else ""
-            pdf.multi_cell(0, 10, f"{step.order}. {safe_text(step.instruction)}{duration}{temp}")
-            if step.tips:
-                pdf.set_font('Arial', 'I', 10)
-                pdf.multi_cell(0, 10, f"Tip: {safe_text(step.tips)}")
-                pdf.set_font('Arial', '', 12)
-            if step.equipment_needed:
-                pdf.set_font('Arial', 'I', 10)
-                pdf.multi_cell(0, 10, f"Equipment: {', '.join(safe_text(eq) for eq in step.equipment_needed)}")
-                pdf.set_font('Arial', '', 12)
-            pdf.ln(2)
-        
-        # Tips & Tricks
-        if recipe.tips_and_tricks:
-            pdf.add_page()
-            pdf.set_font('Arial', 'B', 14)
-            pdf.cell(0, 10, 'Tips & Tricks', ln=True)
-            pdf.set_font('Arial', '', 12)
-            for tip in recipe.tips_and_tricks:
-                pdf.multi_cell(0, 10, f"- {safe_text(tip)}")
-            pdf.ln(5)
-        
-        # Storage & Reheating
-        pdf.set_font('Arial', 'B', 14)
-        pdf.cell(0, 10, 'Storage & Reheating', ln=True)
-        pdf.set_font('Arial', '', 12)
-        pdf.multi_cell(0, 10, f"Storage: {safe_text(recipe.storage_instructions)}")
-        pdf.multi_cell(0, 10, f"Reheating: {safe_text(recipe.reheating_instructions)}")
-        pdf.ln(5)
-        
-        # Shopping List
-        if recipe.shopping_list:
-            pdf.add_page()
-            pdf.set_font('Arial', 'B', 14)
-            pdf.cell(0, 10, 'Shopping List', ln=True)
-            
-            sections = {}
-            for item in recipe.shopping_list:
-                if item.store_section not in sections:
-                    sections[item.store_section] = []
-                sections[item.store_section].append(item)
-            
-            for section, items in sections.items():
-                pdf.set_font('Arial', 'B', 12)
-                pdf.cell(0, 10, safe_text(section), ln=True)
-                pdf.set_font('Arial', '', 12)
-                for item in items:
-                    pdf.cell(0, 10, f"- {item.amount} {safe_text(item.unit)} {safe_text(item.name)}", ln=True)
-                pdf.ln(2)
-        
-        # Save PDF
-        filename = f"recipe_{safe_text(recipe.title.lower().replace(' ', '_'))}_{int(time.time())}.pdf"
-        pdf.output(filename)
-        return filename
-        
+        data = render_recipe_pdf(recipe, thumbnail_path)
+        get_pdf_cache().set('pdf', key, data)
+        return data
+
     except Exception as e:
         print(f"⚠️ PDF export error: {str(e)}")
         return None
 
+def export_recipe_pdf(recipe: Recipe, thumbnail_path: str = None):
+    """Export recipe to PDF with Unicode support"""
+    from pdf_export import safe_text
+
+    data = recipe_pdf(recipe, thumbnail_path)
+    if not data:
+        return None
+
+    filename = f"recipe_{safe_text(recipe.title.lower().replace(' ', '_'))}_{int(time.time())}.pdf"
+    with open(filename, 'wb') as out:
+        out.write(data)
+    return filename
+
+class ExtractionError(Exception):
+    """Raised when a URL can't be turned into a recipe"""
+
+# Caps on concurrent downloads and model calls across all in-flight
+# extractions; the browser stage is already bounded by the pool size
+stage_slots = {
+    'download': threading.BoundedSemaphore(int(os.environ.get('DOWNLOAD_CONCURRENCY', 4))),
+    'llm': threading.BoundedSemaphore(int(os.environ.get('LLM_CONCURRENCY', 8))),
+}
+
+def limited(stage: str, func, *args):
+    """Run func once a slot for the given stage is free"""
+    with stage_slots[stage]:
+        return func(*args)
+
+def no_progress(stage: str, status: str):
+    """Default progress callback for callers that don't track stages"""
+
+def cached_stage(stage: str, key: str, compute, keep=bool, progress=no_progress):
+    """Return a cached stage result, computing and storing it on a miss"""
+    value = get_result_cache().get(stage, key)
+    if value is not None:
+        print(f"♻️ Reusing cached {stage}")
+        progress(stage, 'cached')
+        return value
+    progress(stage, 'started')
+    value = compute()
+    if keep(value):
+        get_result_cache().set(stage, key, value)
+    progress(stage, 'done' if value else 'failed')
+    return value
+
+def extract_recipe_from_url(url: str, progress: Callable[[str, str], None] = no_progress) -> Recipe:
+    """Run the full extraction pipeline for one post
+
+    The video download/transcription branch runs in the background while the
+    post page is scraped, and the thumbnail source image starts downloading as
+    soon as its URL is known, so latency is the slowest branch rather than the
+    sum of all of them. Every stage is cached separately, so a failure late in
+    the pipeline doesn't force the expensive early stages to rerun.
+
+    ``progress`` is called with (stage, status) as each stage starts, finishes,
+    fails or is served from cache.
+    """
+    key = cache_key(url)
+    cached = get_result_cache().get('recipe', key)
+    # A recipe whose thumbnails were evicted falls through and re-renders them
+    if cached and cached.get('thumbnail_url') and not thumbnail_file(cached['thumbnail_url']):
+        cached = None
+    if cached:
+        print("♻️ Recipe already extracted")
+        progress('recipe', 'cached')
+        return Recipe(**cached)
+
+    # Extract video content and transcription in the background
+    video_future = get_pipeline_executor().submit(
+        cached_stage, 'transcript', key,
+        lambda: limited('download', download_and_transcribe_video, url),
+        lambda video_data: bool(video_data and video_data.get('transcription')),
+        progress
+    )
+
+    # Get post content
+    content = cached_stage('content', key, lambda: extract_instagram_content(url), progress=progress)
+    if not content:
+        video_future.cancel()
+        raise ExtractionError("Could not access Instagram content")
+    content = dict(content)
+
+    # Start fetching the thumbnail source while we wait on the video, unless
+    # previously rendered thumbnails are still in the store
+    thumbnails = get_result_cache().get('thumbnail', key)
+    if thumbnails and not thumbnail_file(thumbnails['detail']['jpeg'].get('url')):
+        thumbnails = None
+    image_future = None
+    if content['image_url'] and not thumbnails:
+        image_future = get_image_executor().submit(fetch_image, content['image_url'])
+
+    # Add transcription to content
+    video_data = video_future.result()
+    content['transcription'] = video_data.get('transcription') if video_data else None
+
+    # Parse recipe using GPT-4o structured output, on just the recipe-relevant text
+    def parse():
+        from prompt_trim import trim_content
+        trimmed, tokens = timed('trim', trim_content, content)
+        record_prompt_tokens(tokens['before'], tokens['after'])
+        if tokens['before']:
+            print(f"✂️ Prompt input trimmed {tokens['before']} → {tokens['after']} tokens "
+                  f"({100 * tokens['saved'] // tokens['before']}% saved)")
+        parsed_recipe = limited('llm', timed, 'parse', parse_recipe_content, trimmed)
+        return parsed_recipe.dict() if parsed_recipe else None
+
+    parsed = cached_stage('parsed', key, parse, progress=progress)
+    if not parsed:
+        if image_future:
+            image_future.cancel()
+        raise ExtractionError("Could not create recipe")
+    recipe = Recipe(**parsed)
+
+    # Compute macros locally (before the thumbnail, which prints them)
+    progress('nutrition', 'started')
+    timed('nutrition', calculate_nutrition, [recipe])
+    progress('nutrition', 'done')
+
+    # Generate shopping list
+    progress('shopping_list', 'started')
+    recipe.shopping_list = timed('shopping_list', generate_shopping_list, recipe)
+    progress('shopping_list', 'done')
+
+    # Generate thumbnail
+    if image_future:
+        progress('thumbnail', 'started')
+        thumbnails = generate_thumbnail_variants(recipe, content['image_url'], image_future.result())
+        if thumbnails:
+            get_result_cache().set('thumbnail', key, thumbnails)
+        progress('thumbnail', 'done' if thumbnails else 'failed')
+    elif thumbnails:
+        progress('thumbnail', 'cached')
+    if thumbnails:
+        recipe.thumbnail_url = thumbnails['detail']['jpeg']['url']
+        recipe.thumbnail_variants = thumbnails
+
+    # Only cache the finished recipe once every stage has succeeded
+    if thumbnails or not content['image_url']:
+        get_result_cache().set('recipe', key, recipe.dict())
+
+    return recipe
+
 def process_instagram_recipe():
     """Main recipe processing function"""
     print("✅ Recipe processor ready!")
     print("\nPaste an Instagram recipe URL (or 'q' to quit):")
     
+    try:
+        from IPython.display import clear_output
+    except ImportError:
+        clear_output = lambda: None
+
     while True:
         try:
             url = input().strip()
@@ -629,48 +739,32 @@ def process_instagram_recipe():
                 clear_output()
                 print(f"Processing: {url}")
                 
-                # Extract video content and transcription
-                video_data = download_and_transcribe_video(url)
-                
-                # Get post content
-                content = extract_instagram_content(url)
-                if not content:
-                    print("❌ Could not access Instagram content")
+                try:
+                    recipe = extract_recipe_from_url(url)
+                except ExtractionError as e:
+                    print(f"❌ {str(e)}")
                     continue
+
+                # Display recipe in console
+                display_recipe(recipe)
                 
-                # Add transcription to content
-                content['transcription'] = video_data.get('transcription') if video_data else None
-                
-                # Parse recipe using GPT-4o structured output
-                recipe = parse_recipe_content(content)
-                if recipe:
-                    # Generate shopping list
-                    shopping_list = generate_shopping_list(recipe)
-                    recipe.shopping_list = shopping_list
-                    
-                    # Generate thumbnail
-                    if content['image_url']:
-                        thumbnail_path = generate_thumbnail(recipe, content['image_url'])
-                        recipe.thumbnail_url = thumbnail_path
-                    
-                    # Display recipe in console
-                    display_recipe(recipe)
-                    
-                    # Ask if user wants PDF
-                    pdf_response = input("\nWould you like to download the recipe as PDF? (y/n): ").strip().lower()
-                    if pdf_response == 'y':
-                        # Export PDF
-                        pdf_filename = export_recipe_pdf(recipe, recipe.thumbnail_url)
-                        if pdf_filename:
+                # Ask if user wants PDF
+                pdf_response = input("\nWould you like to download the recipe as PDF? (y/n): ").strip().lower()
+                if pdf_response == 'y':
+                    # Export PDF
+                    pdf_filename = export_recipe_pdf(recipe, recipe.thumbnail_url)
+                    if pdf_filename:
+                        try:
+                            from google.colab import files
                             files.download(pdf_filename)
-                            print(f"✅ PDF exported successfully as '{pdf_filename}'")
-                    
-                    print("\n✅ Recipe processed successfully!")
-                    print("\nOptions:")
-                    print("1. Process another URL (paste URL)")
-                    print("2. Quit (type 'q')")
-                else:
-                    print("❌ Could not create recipe")
+                        except ImportError:
+                            pass
+                        print(f"✅ PDF exported successfully as '{pdf_filename}'")
+                
+                print("\n✅ Recipe processed successfully!")
+                print("\nOptions:")
+                print("1. Process another URL (paste URL)")
+                print("2. Quit (type 'q')")
                 
                 print("\nPaste another URL or 'q' to quit:")
         
@@ -680,7 +774,7 @@ def process_instagram_recipe():
 
     # Cleanup
     try:
-        driver.quit()
+        shutdown()
     except:
         pass
 
@@ -689,4 +783,4 @@ if __name__ == "__main__":
     try:
         process_instagram_recipe()
     finally:
-        driver.quit()
\ No newline at end of file
+        shutdown()
\ No newline at end of file
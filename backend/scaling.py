@@ -0,0 +1,37 @@
+from typing import Optional, Tuple
+from units import UNITS, kitchen_amount, kitchen_unit, normalize_unit, system_of, to_base
+
+SYSTEMS = ('us', 'metric')
+
+
+def scale_amount(amount: float, unit: str, factor: float = 1.0, system: Optional[str] = None,
+                 name: Optional[str] = None, by_weight: bool = False) -> Tuple[float, str]:
+    """Scale a quantity and express it in a readable unit of the target system
+
+    Volumes and masses are re-expressed along the system's unit ladder
+    (16 tbsp becomes 1 cup, 1200 g becomes 1.2 kg); with ``by_weight``,
+    volumes of ingredients with a known density are weighed instead. Other
+    units keep their spelling and are only multiplied. Amounts are rounded
+    to what can be measured in a kitchen, falling back to a smaller unit
+    when a bigger one can't be measured closely. With nothing to scale or
+    convert the amount comes back exactly as given.
+    """
+    if factor == 1.0 and system is None and not by_weight:
+        return amount, unit
+    canonical = normalize_unit(unit)
+    base, dim = to_base((amount or 0.0) * factor, canonical)
+    if dim not in ('volume', 'mass'):
+        size = UNITS[canonical][1] if canonical in UNITS else 1.0
+        return kitchen_amount(base / size, canonical), unit
+
+    target = system or system_of(canonical)
+    if by_weight and dim == 'volume' and name:
+        from nutrition import nutrition_table
+        density = nutrition_table().density_of(name)
+        if density:
+            base, dim = base * density, 'mass'
+
+    if factor == 1.0 and dim == UNITS[canonical][0] and target == system_of(canonical):
+        # Nothing changed, so keep the recipe's own unit
+        return kitchen_amount(amount or 0.0, canonical), unit
+    return kitchen_unit(base, dim, target)
@@ -1,11 +1,27 @@
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, request, jsonify, send_file, Response
 from flask_cors import CORS
 import recipe_extractor
+from jobs import JobManager, QueueFullError
+from batch import run_batch
+from metrics import metrics_payload, register_stats
+import json
 import os
+from io import BytesIO
 
 app = Flask(__name__)
 CORS(app)
 
+job_manager = JobManager(recipe_extractor.extract_recipe_from_url)
+
+# Nested stats are labelled by what they're keyed on
+STATS_LABELS = (('readiness', 'signal'), ('result_cache', 'namespace'), ('http', 'host'))
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    register_stats(recipe_extractor.runtime_stats, STATS_LABELS)
+    data, content_type = metrics_payload()
+    return Response(data, content_type=content_type)
+
 @app.route('/api/extract', methods=['POST'])
 def extract_recipe():
     try:
@@ -14,48 +30,201 @@ def extract_recipe():
         if not url:
             return jsonify({'error': 'URL is required'}), 400
 
-        # Extract video content and transcription
-        video_data = recipe_extractor.download_and_transcribe_video(url)
-        
-        # Get post content
-        content = recipe_extractor.extract_instagram_content(url)
-        if not content:
-            return jsonify({'error': 'Could not access Instagram content'}), 400
-        
-        # Add transcription to content
-        content['transcription'] = video_data.get('transcription') if video_data else None
-        
-        # Parse recipe
-        recipe = recipe_extractor.parse_recipe_content(content)
-        if not recipe:
-            return jsonify({'error': 'Could not create recipe'}), 400
-
-        # Generate shopping list
-        shopping_list = recipe_extractor.generate_shopping_list(recipe)
-        recipe.shopping_list = shopping_list
-        
-        # Generate thumbnail if image available
-        if content['image_url']:
-            thumbnail_path = recipe_extractor.generate_thumbnail(recipe, content['image_url'])
-            recipe.thumbnail_url = thumbnail_path
+        try:
+            recipe = recipe_extractor.extract_recipe_from_url(url)
+        except recipe_extractor.ExtractionError as e:
+            return jsonify({'error': str(e)}), 400
 
         return jsonify(recipe.dict())
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/extract/batch', methods=['POST'])
+def extract_batch():
+    try:
+        data = request.json
+        urls = data.get('urls')
+        if not urls or not isinstance(urls, list) or not all(isinstance(url, str) for url in urls):
+            return jsonify({'error': 'A list of URLs is required'}), 400
+
+        def generate():
+            for result in run_batch(urls, recipe_extractor.extract_recipe_from_url):
+                yield json.dumps(result) + '\n'
+
+        return Response(generate(), mimetype='application/x-ndjson')
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/jobs', methods=['POST'])
+def submit_job():
+    try:
+        data = request.json
+        url = data.get('url')
+        if not url:
+            return jsonify({'error': 'URL is required'}), 400
+
+        try:
+            job = job_manager.submit(url)
+        except QueueFullError as e:
+            return jsonify({'error': f"Too many pending extractions: {str(e)}"}), 503
+
+        return jsonify({
+            'id': job.id,
+            'status': job.status,
+            'status_url': f"/api/jobs/{job.id}",
+            'events_url': f"/api/jobs/{job.id}/events"
+        }), 202
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    job = job_manager.get(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job.to_dict())
+
+@app.route('/api/jobs/<job_id>/events', methods=['GET'])
+def job_events(job_id):
+    job = job_manager.get(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+
+    def generate():
+        for event in job_manager.stream(job):
+            if event is None:
+                yield ": keep-alive\n\n"
+            else:
+                yield f"event: stage\ndata: {json.dumps(event)}\n\n"
+        yield f"event: done\ndata: {json.dumps(job.to_dict())}\n\n"
+
+    return Response(generate(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/api/thumbnails/<key>/<filename>', methods=['GET'])
+def get_thumbnail(key, filename):
+    path = recipe_extractor.get_thumbnail_store().path_for(key, filename)
+    if not path:
+        return jsonify({'error': 'Thumbnail not found'}), 404
+
+    # Content-addressed, so a URL always refers to the same bytes
+    response = send_file(path, etag=f"{key}-{filename}", max_age=365 * 24 * 3600, conditional=True)
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
+
+def resolve_recipes(items):
+    """Recipes for a list of source URLs of stored recipes and/or recipe payloads
+
+    Returns the recipes and None, or whatever was resolved so far and an error
+    response for the first entry that isn't a source URL or a valid recipe
+    """
+    from pydantic import ValidationError
+
+    recipes = []
+    for index, item in enumerate(items):
+        if isinstance(item, str):
+            recipe = recipe_extractor.stored_recipe(item)
+            if not recipe:
+                return recipes, (jsonify({'error': f"Recipe not found: {item}", 'index': index}), 404)
+        elif isinstance(item, dict):
+            try:
+                recipe = recipe_extractor.Recipe(**item)
+            except ValidationError as e:
+                return recipes, (jsonify({
+                    'error': f"recipes[{index}] is not a valid recipe",
+                    'index': index,
+                    'details': json.loads(e.json(include_url=False)),
+                }), 400)
+        else:
+            return recipes, (jsonify({
+                'error': f"recipes[{index}] must be a source URL or a recipe",
+                'index': index,
+            }), 400)
+        recipes.append(recipe)
+    return recipes, None
+
+def requested_servings(data, count):
+    """One servings count for every recipe, or one per recipe; None if invalid"""
+    servings = data.get('servings')
+    if not isinstance(servings, list):
+        servings = [servings] * count
+    if len(servings) != count or any(
+            s is not None and (not isinstance(s, int) or isinstance(s, bool) or s < 1) for s in servings):
+        return None
+    return servings
+
+@app.route('/api/recipes/scale', methods=['POST'])
+def scale_recipes():
+    from scaling import SYSTEMS
+
+    try:
+        data = request.json
+        items = data.get('recipes')
+        if not items or not isinstance(items, list):
+            return jsonify({'error': 'A list of recipe source URLs or recipes is required'}), 400
+
+        servings = requested_servings(data, len(items))
+        if servings is None:
+            return jsonify({'error': 'servings must be a positive integer or one per recipe'}), 400
+
+        system = data.get('system')
+        if system is not None and system not in SYSTEMS:
+            return jsonify({'error': f"system must be one of {', '.join(SYSTEMS)}"}), 400
+
+        recipes, failure = resolve_recipes(items)
+        if failure:
+            return failure
+
+        by_weight = bool(data.get('by_weight'))
+        return jsonify({'recipes': [
+            recipe_extractor.scale_recipe(recipe, count, system, by_weight).dict()
+            for recipe, count in zip(recipes, servings)
+        ]})
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/meal-plan/shopping-list', methods=['POST'])
+def meal_plan_shopping_list():
+    from meal_plan import aggregate_meal_plan, plan_sections
+
+    try:
+        data = request.json
+        items = data.get('recipes')
+        if not items or not isinstance(items, list):
+            return jsonify({'error': 'A list of recipe source URLs or recipes is required'}), 400
+
+        servings = requested_servings(data, len(items))
+        if servings is None:
+            return jsonify({'error': 'servings must be a positive integer or one per recipe'}), 400
+
+        recipes, failure = resolve_recipes(items)
+        if failure:
+            return failure
+
+        shopping = aggregate_meal_plan(recipes, servings)
+        return jsonify({'recipes': len(recipes), 'items': shopping, 'sections': plan_sections(shopping)})
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/pdf', methods=['POST'])
 def generate_pdf():
     try:
         data = request.json
         recipe = recipe_extractor.Recipe(**data)
-        pdf_filename = recipe_extractor.export_recipe_pdf(recipe, recipe.thumbnail_url)
-        
-        if not pdf_filename:
+        # Only thumbnails from our own store are embedded, never client paths
+        pdf_data = recipe_extractor.recipe_pdf(recipe)
+
+        if not pdf_data:
             return jsonify({'error': 'Failed to generate PDF'}), 500
 
         return send_file(
-            pdf_filename,
+            BytesIO(pdf_data),
             mimetype='application/pdf',
             as_attachment=True,
             download_name=f"recipe_{recipe.title.lower().replace(' ', '_')}.pdf"
@@ -64,5 +233,29 @@ def generate_pdf():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/pdf/cookbook', methods=['POST'])
+def generate_cookbook():
+    from cookbook import render_cookbook
+
+    try:
+        data = request.json
+        items = data.get('recipes')
+        if not items or not isinstance(items, list):
+            return jsonify({'error': 'A list of recipe source URLs or recipes is required'}), 400
+
+        # Resolve everything up front so a bad entry fails before streaming starts
+        recipes, failure = resolve_recipes(items)
+        if failure:
+            return failure
+
+        return Response(
+            render_cookbook(recipes, recipe_extractor.pdf_thumbnail),
+            mimetype='application/pdf',
+            headers={'Content-Disposition': 'attachment; filename="cookbook.pdf"'}
+        )
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 if __name__ == '__main__':
     app.run(port=5000)
\ No newline at end of file
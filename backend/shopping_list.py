@@ -0,0 +1,91 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from ingredients import canonical_name, is_bought, store_section
+from units import display_unit, normalize_unit, system_of, to_base
+
+
+def _amount(value: float) -> float:
+    return round(value, 2)
+
+
+def _field(item: Any, name: str) -> Any:
+    return item[name] if isinstance(item, dict) else getattr(item, name)
+
+
+class ShoppingIndex:
+    """Running totals of things to buy, hashed by canonical name and dimension
+
+    Adding an ingredient is a dict lookup, so folding a whole meal plan into
+    one list costs time linear in the number of ingredients.
+    """
+
+    def __init__(self):
+        self._entries: Dict[Tuple[str, str], Dict[str, Any]] = {}
+
+    def add(self, name: str, amount: Optional[float], unit: Optional[str], category: str,
+            section: Optional[str] = None) -> None:
+        if not is_bought(name):
+            return
+        canonical = canonical_name(name)
+        unit = normalize_unit(unit)
+        base, dim = to_base(amount or 0.0, unit)
+
+        entry = self._entries.get((canonical, dim))
+        if entry is None:
+            self._entries[(canonical, dim)] = {
+                'name': canonical,
+                'base': base,
+                'dimension': dim,
+                'units': {unit},
+                'category': category,
+                'store_section': section or store_section(name, category),
+            }
+        else:
+            entry['base'] += base
+            entry['units'].add(unit)
+
+    def add_ingredients(self, ingredients: Iterable[Any], factor: float = 1.0) -> None:
+        for ingredient in ingredients:
+            self.add(ingredient.name, (ingredient.amount or 0.0) * factor, ingredient.unit, ingredient.category)
+
+    def items(self) -> List[Dict[str, Any]]:
+        """ShoppingItem-shaped dicts ordered by store section and name"""
+        items = []
+        for entry in self._entries.values():
+            if len(entry['units']) == 1:
+                # Keep the recipe's own unit when nothing needed converting
+                unit = next(iter(entry['units']))
+                amount = entry['base'] / to_base(1.0, unit)[0]
+            else:
+                system = 'metric' if all(system_of(u) == 'metric' for u in entry['units']) else 'us'
+                amount, unit = display_unit(entry['base'], entry['dimension'], system)
+            items.append({
+                'name': entry['name'],
+                'amount': _amount(amount),
+                'unit': unit,
+                'category': entry['category'],
+                'store_section': entry['store_section'],
+            })
+
+        items.sort(key=lambda item: (item['store_section'], item['name']))
+        return items
+
+
+def build_shopping_list(ingredients: Iterable[Any]) -> List[Dict[str, Any]]:
+    """Shopping items for a recipe's ingredients, one per thing to buy
+
+    Ingredients are mapped to canonical names and store sections, and
+    duplicates with convertible units are summed ("2 tbsp butter" and
+    "1/4 cup butter" become one line). Returns ShoppingItem-shaped dicts
+    ordered by store section and name.
+    """
+    index = ShoppingIndex()
+    index.add_ingredients(ingredients)
+    return index.items()
+
+
+def group_by_section(items: Iterable[Any]) -> Dict[str, List[Any]]:
+    """Shopping items (models or dicts) grouped by store section, sections sorted"""
+    sections: Dict[str, List[Any]] = {}
+    for item in items:
+        sections.setdefault(_field(item, 'store_section'), []).append(item)
+    return {section: sections[section] for section in sorted(sections)}
@@ -0,0 +1,39 @@
+from types import SimpleNamespace
+import pytest
+from ingredients import canonical_name, lookup
+from shopping_list import build_shopping_list
+
+
+def ingredient(name, amount, unit, category='pantry'):
+    return SimpleNamespace(name=name, amount=amount, unit=unit, category=category)
+
+
+@pytest.mark.parametrize('name', [
+    'almond flour', 'rice flour', 'almond butter', 'cauliflower rice',
+    'poblano pepper', 'green peppercorns', 'garlic salt',
+])
+def test_different_products_are_not_folded_into_their_last_word(name):
+    assert lookup(name) is None
+    assert canonical_name(name) == name
+
+
+@pytest.mark.parametrize('name, expected', [
+    ('extra sharp cheddar cheese', 'cheddar cheese'),
+    ('unsalted butter', 'butter'),
+    ('boneless, skinless chicken thighs', 'chicken thigh'),
+    ('low-sodium chicken broth', 'chicken broth'),
+    ('freshly ground black pepper', 'black pepper'),
+])
+def test_qualifiers_are_dropped(name, expected):
+    assert canonical_name(name) == expected
+
+
+def test_distinct_flours_stay_separate_on_the_shopping_list():
+    items = build_shopping_list([
+        ingredient('almond flour', 2, 'cup'),
+        ingredient('all-purpose flour', 1, 'cup'),
+    ])
+    assert [(item['name'], item['amount'], item['unit']) for item in items] == [
+        ('all-purpose flour', 1, 'cup'),
+        ('almond flour', 2, 'cup'),
+    ]
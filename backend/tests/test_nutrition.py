@@ -0,0 +1,35 @@
+from types import SimpleNamespace
+from nutrition import compute_nutrition
+
+
+def recipe(*ingredients, servings=1):
+    return SimpleNamespace(servings=servings, ingredients=[
+        SimpleNamespace(name=name, amount=amount, unit=unit) for name, amount, unit in ingredients
+    ])
+
+
+def test_units_are_weighed_per_ingredient():
+    cinnamon, butter = compute_nutrition([
+        recipe(('cinnamon', 1, 'stick')),
+        recipe(('butter', 1, 'stick')),
+    ])
+    assert cinnamon['macros']['calories'] < 10
+    assert butter['macros']['calories'] > 700
+
+
+def test_unit_without_an_ingredient_weight_is_unresolved():
+    result, = compute_nutrition([recipe(('olive oil', 1, 'can'), ('salt', 1, 'tsp'))])
+    assert result['contributions'][0] is None
+    assert result['coverage'] == 0.5
+
+
+def test_unknown_ingredients_lower_coverage():
+    result, = compute_nutrition([recipe(('almond flour', 2, 'cup'), ('sugar', 100, 'g'))])
+    assert result['contributions'][0] is None
+    assert result['coverage'] == 0.5
+    assert result['macros']['calories'] == 387
+
+
+def test_bare_count_and_slices_of_bacon_agree():
+    count, slices = compute_nutrition([recipe(('bacon', 2, '')), recipe(('bacon', 2, 'slices'))])
+    assert count['macros'] == slices['macros']
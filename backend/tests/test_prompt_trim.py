@@ -0,0 +1,41 @@
+from prompt_trim import trim_content
+
+CAPTION = """Herb roasted potatoes
+Ingredients:
+2 lb potatoes
+3 tbsp olive oil
+salt
+pepper
+parsley
+oregano
+Roast at 425F for 35 minutes."""
+
+
+def test_captions_keep_one_word_ingredient_lines():
+    trimmed, tokens = trim_content({'text_content': CAPTION, 'text_source': 'caption', 'transcription': None})
+    assert trimmed['text_content'] == CAPTION
+    assert tokens['saved'] == 0
+
+
+def test_body_fallback_keeps_one_word_ingredients_and_drops_comments():
+    body = "\n".join([
+        "Log in", "chef.maria", CAPTION, "#potatoes #sidedish", "2w",
+        "View all 12 comments",
+        "foodie_jane", "salt is the secret", "1w", "Reply",
+        "More posts from chef.maria", "Privacy", "Terms",
+    ])
+    trimmed, tokens = trim_content({'text_content': body, 'text_source': 'body', 'transcription': None})
+    assert trimmed['text_content'] == CAPTION
+    assert tokens['saved'] > 0
+
+
+def test_article_text_drops_comment_thread():
+    article = "\n".join([
+        "chef.maria", "Follow", CAPTION, "2w",
+        "foodie_jane", "salt is the secret", "1w", "3 likes", "Reply",
+        "potato.lover", "making this tonight", "5d", "Reply",
+        "View replies (2)", "1,204 likes", "Add a comment…",
+    ])
+    trimmed, tokens = trim_content({'text_content': article, 'text_source': 'article', 'transcription': None})
+    assert trimmed['text_content'] == CAPTION
+    assert tokens['saved'] > 0
@@ -0,0 +1,30 @@
+import pytest
+from scaling import scale_amount
+from units import format_amount, kitchen_amount
+
+
+@pytest.mark.parametrize('amount, text', [(3.875, '3 7/8'), (0.375, '3/8'), (1.625, '1 5/8'), (0.3, '0.3')])
+def test_amounts_format_as_eighths(amount, text):
+    assert format_amount(amount) == text
+
+
+def test_eighths_survive_kitchen_rounding():
+    assert kitchen_amount(0.375, 'cup') == 0.375
+
+
+def test_doubled_tablespoons_stay_tablespoons():
+    assert scale_amount(3, 'tbsp', 2) == (6, 'tbsp')
+
+
+def test_cups_are_used_once_they_measure_closely():
+    assert scale_amount(1, 'cup', 2) == (2, 'cup')
+    assert scale_amount(4, 'tbsp', 4) == (1, 'cup')
+
+
+def test_nothing_to_do_returns_the_amount_unchanged():
+    assert scale_amount(0.3, 'cups') == (0.3, 'cups')
+    assert scale_amount(2.2, 'oz', 1.0, None) == (2.2, 'oz')
+
+
+def test_conversion_to_metric():
+    assert scale_amount(1, 'cup', 1.0, 'metric') == (235, 'ml')
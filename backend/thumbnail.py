@@ -0,0 +1,271 @@
+import functools
+import json
+import math
+import os
+import time
+from io import BytesIO
+from typing import Any, Dict, Tuple
+import numpy as np
+from PIL import Image as PILImage, ImageDraw, ImageFont, features
+
+TARGET_WIDTH = 1280
+TARGET_HEIGHT = 720
+TITLE_FONT_SIZE = 48
+MACRO_FONT_SIZE = 32
+TITLE_LINE_HEIGHT = 50
+TEXT_MARGIN = 40
+
+# Resampling quality tiers. Sources are decoded at a reduced JPEG scale that
+# still covers the target times ``oversample``, then box-reduced to within
+# ``reducing_gap`` of it before the final resample.
+QUALITY_TIERS = {
+    'fast': {'resample': PILImage.BILINEAR, 'oversample': 1.0, 'reducing_gap': 1.5},
+    'balanced': {'resample': PILImage.BICUBIC, 'oversample': 1.5, 'reducing_gap': 2.0},
+    'best': {'resample': PILImage.LANCZOS, 'oversample': 2.0, 'reducing_gap': 3.0},
+}
+DEFAULT_QUALITY = os.environ.get('THUMBNAIL_QUALITY', 'balanced')
+
+# Sizes clients pick from, all rendered from one decoded source and one
+# composed overlay. The PDF variant stays baseline JPEG so any viewer can
+# embed it.
+VARIANTS = {
+    'detail': {'size': (1280, 720), 'formats': ('jpeg', 'webp')},
+    'card': {'size': (640, 360), 'formats': ('jpeg', 'webp')},
+    'pdf': {'size': (800, 450), 'formats': ('jpeg',), 'progressive': False},
+}
+ENCODERS = {
+    'jpeg': {'ext': 'jpg', 'pil_format': 'JPEG', 'params': {'quality': 82, 'optimize': True}},
+    'webp': {'ext': 'webp', 'pil_format': 'WEBP', 'params': {'quality': 78, 'method': 4}},
+}
+
+# Try multiple font paths
+FONT_PATHS = [
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+    "/usr/share/fonts/dejavu/DejaVuSans-Bold.ttf",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+    "arial.ttf"  # Fallback to system Arial
+]
+
+
+@functools.lru_cache(maxsize=None)
+def load_font(size: int) -> ImageFont.ImageFont:
+    """First available font at the given size, probed once per process"""
+    for path in FONT_PATHS:
+        try:
+            return ImageFont.truetype(path, size)
+        except OSError:
+            continue
+    print(f"⚠️ Using default font for size {size}")
+    return ImageFont.load_default()
+
+
+@functools.lru_cache(maxsize=4)
+def gradient_overlay(width: int = TARGET_WIDTH, height: int = TARGET_HEIGHT) -> PILImage.Image:
+    """Transparent overlay darkening the bottom third, built once per size
+
+    Callers must copy it before drawing on it.
+    """
+    gradient_height = height // 3
+    alpha = np.zeros((height, width), dtype=np.uint8)
+    ramp = (255 * np.arange(gradient_height) / gradient_height).astype(np.uint8)
+    alpha[height - gradient_height:, :] = ramp[:, None]
+    rgba = np.zeros((height, width, 4), dtype=np.uint8)
+    rgba[..., 3] = alpha
+    return PILImage.fromarray(rgba, 'RGBA')
+
+
+@functools.lru_cache(maxsize=1024)
+def wrap_title(title: str, font_size: int, max_width: int) -> Tuple[str, ...]:
+    """Greedy word wrap of the title to max_width pixels"""
+    font = load_font(font_size)
+    lines = []
+    current_line = []
+
+    for word in title.split():
+        current_line.append(word)
+        line_text = ' '.join(current_line)
+        bbox = font.getbbox(line_text)
+        line_width = bbox[2] - bbox[0] if bbox else 0
+
+        if line_width > max_width:
+            if len(current_line) > 1:
+                current_line.pop()
+                lines.append(' '.join(current_line))
+                current_line = [word]
+            else:
+                lines.append(line_text)
+                current_line = []
+
+    if current_line:
+        lines.append(' '.join(current_line))
+    return tuple(lines)
+
+
+def macro_line(recipe) -> str:
+    macros = recipe.macros
+    return (
+        f"{macros.calories} cal | "
+        f"P:{macros.protein_g:.1f}g ({macros.protein_percentage:.0f}%) | "
+        f"C:{macros.carbs_g:.1f}g ({macros.carbs_percentage:.0f}%) | "
+        f"F:{macros.fat_g:.1f}g ({macros.fat_percentage:.0f}%)"
+    )
+
+
+def _pixel_bytes(size: Tuple[int, int], mode: str) -> int:
+    return size[0] * size[1] * PILImage.getmodebands(mode)
+
+
+def decode_source(image_data: bytes, width: int = TARGET_WIDTH, height: int = TARGET_HEIGHT,
+                  quality: str = DEFAULT_QUALITY) -> Tuple[PILImage.Image, Dict[str, Any]]:
+    """Decode only as many pixels as the thumbnail needs
+
+    JPEGs are decoded in draft mode at the smallest 1/2, 1/4 or 1/8 scale
+    that still covers the target. Returns the decoded image and memory
+    accounting for the decode.
+    """
+    tier = QUALITY_TIERS[quality]
+    started = time.perf_counter()
+    img = PILImage.open(BytesIO(image_data))
+    full_size, full_mode = img.size, img.mode
+
+    ratio = min(width / img.width, height / img.height) * tier['oversample']
+    if img.format == 'JPEG' and ratio < 1:
+        img.draft('RGB', (math.ceil(img.width * ratio), math.ceil(img.height * ratio)))
+    img.load()
+
+    return img, {
+        'source_bytes': len(image_data),
+        'full_size': full_size,
+        'decoded_size': img.size,
+        'draft_scale': img.width / full_size[0],
+        'full_decode_bytes': _pixel_bytes(full_size, full_mode),
+        'decoded_bytes': _pixel_bytes(img.size, img.mode),
+        'decode_seconds': time.perf_counter() - started,
+    }
+
+
+def fit_image(img: PILImage.Image, width: int = TARGET_WIDTH, height: int = TARGET_HEIGHT,
+              quality: str = DEFAULT_QUALITY) -> PILImage.Image:
+    """Scale the photo to fit the frame and center it on a white background"""
+    tier = QUALITY_TIERS[quality]
+
+    # Calculate new dimensions preserving aspect ratio
+    width_ratio = width / img.width
+    height_ratio = height / img.height
+
+    if width_ratio < height_ratio:
+        new_width = width
+        new_height = int(img.height * width_ratio)
+    else:
+        new_height = height
+        new_width = int(img.width * height_ratio)
+
+    img = img.resize((new_width, new_height), tier['resample'], reducing_gap=tier['reducing_gap'])
+
+    background = PILImage.new('RGB', (width, height), (255, 255, 255))
+    background.paste(img, ((width - new_width) // 2, (height - new_height) // 2))
+    return background
+
+
+def compose_overlay(recipe, width: int = TARGET_WIDTH, height: int = TARGET_HEIGHT) -> PILImage.Image:
+    """Gradient plus title and macro text, each with a drop shadow"""
+    overlay = gradient_overlay(width, height).copy()
+    draw = ImageDraw.Draw(overlay)
+
+    title_font = load_font(TITLE_FONT_SIZE)
+    title_y = height - 140
+    for line in wrap_title(recipe.title, TITLE_FONT_SIZE, width - 2 * TEXT_MARGIN):
+        draw.text((TEXT_MARGIN + 2, title_y + 2), line, font=title_font, fill='black')
+        draw.text((TEXT_MARGIN, title_y), line, font=title_font, fill='white')
+        title_y += TITLE_LINE_HEIGHT
+
+    macro_font = load_font(MACRO_FONT_SIZE)
+    text = macro_line(recipe)
+    draw.text((TEXT_MARGIN + 2, height - 58), text, font=macro_font, fill='black')
+    draw.text((TEXT_MARGIN, height - 60), text, font=macro_font, fill='white')
+    return overlay
+
+
+def render_thumbnail(recipe, image_data: bytes,
+                     quality: str = DEFAULT_QUALITY) -> Tuple[PILImage.Image, Dict[str, Any]]:
+    """Render the finished RGB thumbnail from the source image bytes
+
+    Returns the image and per-render stats: decode and resize timings, the
+    decoded versus full-resolution pixel buffer sizes, and an estimate (from
+    buffer dimensions, not a measurement) of the most bytes held in pixel
+    buffers at once.
+    """
+    img, stats = decode_source(image_data, quality=quality)
+
+    started = time.perf_counter()
+    fitted = fit_image(img, quality=quality)
+    stats['resize_seconds'] = time.perf_counter() - started
+
+    overlay = compose_overlay(recipe)
+    final_img = PILImage.alpha_composite(fitted.convert('RGBA'), overlay)
+    frame_rgba = _pixel_bytes((TARGET_WIDTH, TARGET_HEIGHT), 'RGBA')
+    # Decoded source and fitted frame overlap during the resize; the overlay,
+    # RGBA copy and composite overlap during compositing
+    stats['estimated_pixel_bytes'] = max(
+        stats['decoded_bytes'] + _pixel_bytes(fitted.size, fitted.mode),
+        3 * frame_rgba
+    )
+    stats['quality'] = quality
+    return final_img.convert('RGB'), stats  # Convert back to RGB for JPEG support
+
+
+def encode(img: PILImage.Image, fmt: str, progressive: bool = True) -> bytes:
+    encoder = ENCODERS[fmt]
+    params = dict(encoder['params'])
+    if fmt == 'jpeg':
+        params['progressive'] = progressive
+    buffer = BytesIO()
+    img.save(buffer, encoder['pil_format'], **params)
+    return buffer.getvalue()
+
+
+def render_variants(recipe, image_data: bytes, variants: Dict[str, Dict[str, Any]] = None,
+                    quality: str = DEFAULT_QUALITY) -> Tuple[Dict[str, Dict[str, Dict[str, Any]]], Dict[str, Any]]:
+    """Render the thumbnail once and encode every configured size and format
+
+    The full-size composite is downscaled for the smaller variants, so the
+    source is decoded and the overlay drawn only once. Returns
+    ``{variant: {format: {'data', 'ext', 'width', 'height', 'bytes'}}}`` and the
+    render stats. Formats this Pillow build can't write are skipped.
+    """
+    variants = variants or VARIANTS
+    master, stats = render_thumbnail(recipe, image_data, quality=quality)
+    tier = QUALITY_TIERS[quality]
+
+    encoded: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    for name, spec in variants.items():
+        size = tuple(spec['size'])
+        img = master if size == master.size else master.resize(
+            size, tier['resample'], reducing_gap=tier['reducing_gap'])
+        encoded[name] = {}
+        for fmt in spec['formats']:
+            if fmt == 'webp' and not features.check('webp'):
+                continue
+            data = encode(img, fmt, spec.get('progressive', True))
+            encoded[name][fmt] = {
+                'data': data, 'ext': ENCODERS[fmt]['ext'],
+                'width': size[0], 'height': size[1], 'bytes': len(data)
+            }
+    return encoded, stats
+
+
+def render_signature(quality: str = DEFAULT_QUALITY, variants: Dict[str, Dict[str, Any]] = None) -> str:
+    """Stable description of every setting that affects the rendered pixels
+
+    Part of the thumbnail store key, so changing sizes, encoders or the
+    quality tier produces new files instead of serving stale ones.
+    """
+    return json.dumps({
+        'target': (TARGET_WIDTH, TARGET_HEIGHT),
+        'fonts': (TITLE_FONT_SIZE, MACRO_FONT_SIZE, TITLE_LINE_HEIGHT, TEXT_MARGIN),
+        'quality': quality,
+        'tier': QUALITY_TIERS[quality],
+        'variants': variants or VARIANTS,
+        'encoders': {fmt: encoder['params'] for fmt, encoder in ENCODERS.items()},
+        'webp': features.check('webp'),
+    }, sort_keys=True, default=int)
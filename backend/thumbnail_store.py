@@ -0,0 +1,155 @@
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+import uuid
+from typing import Any, Dict, Optional
+
+URL_PREFIX = '/api/thumbnails'
+MANIFEST_NAME = 'manifest.json'
+_KEY_PATTERN = re.compile(r'^[0-9a-f]{64}$')
+_FILENAME_PATTERN = re.compile(r'^[a-z0-9_]+\.(jpg|webp)$')
+
+
+class ThumbnailStore:
+    """Content-addressed thumbnail variants on disk
+
+    Entries are keyed by a hash of the source image bytes, the overlay text
+    and the render parameters, so identical renders are stored once and never
+    re-rendered. Each entry lives in ``root/ab/cd/<key>/`` with one file per
+    variant plus a manifest. Once the store grows past ``max_bytes`` the least
+    recently used entries are deleted.
+    """
+
+    def __init__(self, root: str, max_bytes: int):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+        self._total = sum(self._entry_size(path) for path in self._entries())
+
+    @staticmethod
+    def key_for(image_data: bytes, title: str, overlay_text: str, render_params: str) -> str:
+        digest = hashlib.sha256()
+        digest.update(hashlib.sha256(image_data).digest())
+        for part in (title, overlay_text, render_params):
+            digest.update(b'\0' + part.encode('utf-8'))
+        return digest.hexdigest()
+
+    def _dir(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], key[2:4], key)
+
+    def _entries(self):
+        for first in os.scandir(self.root):
+            if not first.is_dir():
+                continue
+            for second in os.scandir(first.path):
+                if not second.is_dir():
+                    continue
+                for entry in os.scandir(second.path):
+                    if entry.is_dir() and _KEY_PATTERN.match(entry.name):
+                        yield entry.path
+
+    @staticmethod
+    def _entry_size(path: str) -> int:
+        return sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Manifest for a stored render, marking it recently used"""
+        manifest_path = os.path.join(self._dir(key), MANIFEST_NAME)
+        try:
+            with open(manifest_path, encoding='utf-8') as manifest_file:
+                manifest = json.load(manifest_file)
+            os.utime(manifest_path)
+        except (OSError, ValueError):
+            return None
+        return manifest
+
+    def put(self, key: str, encoded: Dict[str, Dict[str, Dict[str, Any]]]) -> Dict[str, Any]:
+        """Store encoded variants and return their manifest
+
+        Files are written to a scratch directory and renamed into place, so
+        readers never see a partial entry and concurrent renders of the same
+        key simply keep the first.
+        """
+        final_dir = self._dir(key)
+        scratch_dir = f"{final_dir}.tmp-{uuid.uuid4().hex}"
+        os.makedirs(scratch_dir)
+
+        manifest: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        size = 0
+        for name, formats in encoded.items():
+            manifest[name] = {}
+            for fmt, variant in formats.items():
+                filename = f"{name}.{variant['ext']}"
+                with open(os.path.join(scratch_dir, filename), 'wb') as out:
+                    out.write(variant['data'])
+                size += variant['bytes']
+                manifest[name][fmt] = {
+                    'url': f"{URL_PREFIX}/{key}/{filename}",
+                    'width': variant['width'],
+                    'height': variant['height'],
+                    'bytes': variant['bytes'],
+                }
+        with open(os.path.join(scratch_dir, MANIFEST_NAME), 'w', encoding='utf-8') as manifest_file:
+            json.dump(manifest, manifest_file)
+
+        try:
+            os.rename(scratch_dir, final_dir)
+        except OSError:
+            # Someone else stored the same render first
+            shutil.rmtree(scratch_dir, ignore_errors=True)
+            return self.get(key) or manifest
+
+        with self._lock:
+            self._total += size
+            over_limit = self._total > self.max_bytes
+        if over_limit:
+            self.collect_garbage()
+        return manifest
+
+    def path_for(self, key: str, filename: str) -> Optional[str]:
+        """Filesystem path of a stored variant, or None for unknown or unsafe names"""
+        if not _KEY_PATTERN.match(key) or not _FILENAME_PATTERN.match(filename):
+            return None
+        path = os.path.join(self._dir(key), filename)
+        return path if os.path.isfile(path) else None
+
+    def path_for_url(self, url: str) -> Optional[str]:
+        """Resolve a URL from a manifest back to its file"""
+        if not url or not url.startswith(URL_PREFIX + '/'):
+            return None
+        parts = url[len(URL_PREFIX) + 1:].split('/')
+        return self.path_for(*parts) if len(parts) == 2 else None
+
+    def collect_garbage(self, target_ratio: float = 0.9):
+        """Delete least recently used entries until under target_ratio of max_bytes"""
+        with self._lock:
+            entries = []
+            for path in self._entries():
+                try:
+                    used = os.stat(os.path.join(path, MANIFEST_NAME)).st_mtime
+                except OSError:
+                    used = 0
+                entries.append((used, path))
+            entries.sort()
+
+            total = sum(self._entry_size(path) for _, path in entries)
+            target = self.max_bytes * target_ratio
+            removed = 0
+            for _, path in entries:
+                if total <= target:
+                    break
+                size = self._entry_size(path)
+                shutil.rmtree(path, ignore_errors=True)
+                total -= size
+                removed += 1
+            self._total = total
+        if removed:
+            print(f"🧹 Removed {removed} old thumbnails")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {'bytes': self._total, 'max_bytes': self.max_bytes}
@@ -0,0 +1,190 @@
+import re
+from typing import Optional, Tuple
+
+# Canonical unit -> (dimension, size in the dimension's base unit). Volume is
+# measured in millilitres and mass in grams; count-like units that can't be
+# converted into one another are their own dimension.
+UNITS = {
+    'ml': ('volume', 1.0),
+    'l': ('volume', 1000.0),
+    'tsp': ('volume', 4.92892),
+    'tbsp': ('volume', 14.7868),
+    'fl oz': ('volume', 29.5735),
+    'cup': ('volume', 236.588),
+    'pint': ('volume', 473.176),
+    'quart': ('volume', 946.353),
+    'gallon': ('volume', 3785.41),
+    'mg': ('mass', 0.001),
+    'g': ('mass', 1.0),
+    'kg': ('mass', 1000.0),
+    'oz': ('mass', 28.3495),
+    'lb': ('mass', 453.592),
+    '': ('count', 1.0),
+    'dozen': ('count', 12.0),
+    'clove': ('clove', 1.0),
+    'can': ('can', 1.0),
+    'jar': ('jar', 1.0),
+    'package': ('package', 1.0),
+    'bunch': ('bunch', 1.0),
+    'head': ('head', 1.0),
+    'sprig': ('sprig', 1.0),
+    'slice': ('slice', 1.0),
+    'stick': ('stick', 1.0),
+    'pinch': ('pinch', 1.0),
+    'dash': ('dash', 1.0),
+    'handful': ('handful', 1.0),
+}
+
+UNIT_ALIASES = {
+    'milliliter': 'ml', 'millilitre': 'ml', 'mls': 'ml', 'cc': 'ml',
+    'liter': 'l', 'litre': 'l', 'lt': 'l', 'ltr': 'l',
+    'teaspoon': 'tsp', 'tsps': 'tsp', 'tspn': 'tsp', 't': 'tsp',
+    'tablespoon': 'tbsp', 'tbsps': 'tbsp', 'tbs': 'tbsp', 'tbl': 'tbsp', 'tbsp.': 'tbsp',
+    'fluid ounce': 'fl oz', 'fl. oz': 'fl oz', 'floz': 'fl oz', 'fl oz.': 'fl oz',
+    'c': 'cup', 'cups': 'cup',
+    'pt': 'pint', 'qt': 'quart', 'gal': 'gallon',
+    'milligram': 'mg',
+    'gram': 'g', 'gr': 'g', 'grs': 'g', 'gs': 'g',
+    'kilogram': 'kg', 'kilo': 'kg', 'kgs': 'kg',
+    'ounce': 'oz', 'oz.': 'oz',
+    'pound': 'lb', 'lbs': 'lb', 'lb.': 'lb', '#': 'lb',
+    'piece': '', 'pc': '', 'pcs': '', 'whole': '', 'each': '', 'ea': '', 'item': '',
+    'large': '', 'medium': '', 'small': '', 'unit': '', 'x': '',
+    'pkg': 'package', 'packet': 'package', 'pack': 'package', 'bag': 'package', 'box': 'package',
+    'tin': 'can', 'bottle': 'jar',
+}
+
+# Volume and mass units by measuring system, smallest first, with the amount
+# in base units from which each is preferred for display
+DISPLAY_UNITS = {
+    ('volume', 'us'): (('tsp', 0.0), ('tbsp', 14.7868), ('cup', 118.294), ('quart', 1892.71), ('gallon', 7570.82)),
+    ('volume', 'metric'): (('ml', 0.0), ('l', 1000.0)),
+    ('mass', 'us'): (('oz', 0.0), ('lb', 453.592)),
+    ('mass', 'metric'): (('g', 0.0), ('kg', 1000.0)),
+}
+METRIC_UNITS = frozenset({'ml', 'l', 'mg', 'g', 'kg'})
+
+_CAPITAL_T = re.compile(r'^T\.?$')
+
+
+def normalize_unit(unit: Optional[str]) -> str:
+    """Canonical spelling of a unit; unknown units come back lower-cased"""
+    if not unit:
+        return ''
+    raw = unit.strip()
+    # "T" is the conventional abbreviation for tablespoon, "t" for teaspoon
+    if _CAPITAL_T.match(raw):
+        return 'tbsp'
+    text = ' '.join(raw.lower().split())
+    if text in UNITS:
+        return text
+    if text in UNIT_ALIASES:
+        return UNIT_ALIASES[text]
+    stripped = text.rstrip('.')
+    for candidate in (stripped, stripped[:-1] if stripped.endswith('s') else None,
+                      stripped[:-2] if stripped.endswith('es') else None):
+        if candidate is None:
+            continue
+        if candidate in UNITS:
+            return candidate
+        if candidate in UNIT_ALIASES:
+            return UNIT_ALIASES[candidate]
+    return text
+
+
+def dimension(unit: str) -> str:
+    """What the unit measures; unknown units are only comparable with themselves"""
+    return UNITS[unit][0] if unit in UNITS else unit
+
+
+def to_base(amount: float, unit: str) -> Tuple[float, str]:
+    """Amount in the base unit of its dimension, and that dimension"""
+    if unit in UNITS:
+        dim, factor = UNITS[unit]
+        return amount * factor, dim
+    return amount, unit
+
+
+def convert(amount: float, from_unit: str, to_unit: str) -> Optional[float]:
+    """Convert between units of the same dimension, or None if they differ"""
+    base, dim = to_base(amount, from_unit)
+    if dimension(to_unit) != dim:
+        return None
+    return base / UNITS[to_unit][1] if to_unit in UNITS else base
+
+
+def system_of(unit: str) -> str:
+    return 'metric' if unit in METRIC_UNITS else 'us'
+
+
+def display_unit(base_amount: float, dim: str, system: str = 'us') -> Tuple[float, str]:
+    """Express a base amount in the most readable unit of the given system"""
+    ladder = DISPLAY_UNITS.get((dim, system))
+    if not ladder:
+        return base_amount, '' if dim == 'count' else dim
+    chosen = ladder[0][0]
+    for unit, threshold in ladder:
+        if base_amount >= threshold:
+            chosen = unit
+    return base_amount / UNITS[chosen][1], chosen
+
+
+# Fractions a cook can measure with a standard set of cups and spoons
+KITCHEN_FRACTIONS = ((0.0, ''), (0.125, '1/8'), (0.25, '1/4'), (1 / 3, '1/3'), (0.375, '3/8'), (0.5, '1/2'),
+                     (0.625, '5/8'), (2 / 3, '2/3'), (0.75, '3/4'), (0.875, '7/8'), (1.0, ''))
+# Largest relative error accepted when rounding to a bigger unit; past it a
+# smaller unit on the ladder is used ("6 tbsp" rather than "1/3 cup")
+KITCHEN_TOLERANCE = 0.03
+# (upper bound, rounding step) for small metric units
+METRIC_STEPS = ((10.0, 0.5), (100.0, 1.0), (500.0, 5.0), (float('inf'), 10.0))
+
+
+def _nearest_fraction(fraction: float) -> Tuple[float, str]:
+    return min(KITCHEN_FRACTIONS, key=lambda entry: abs(entry[0] - fraction))
+
+
+def kitchen_amount(amount: float, unit: str) -> float:
+    """Round an amount to something measurable: whole grams and millilitres,
+    or eighths, thirds and halves of everything else"""
+    if amount <= 0:
+        return 0.0
+    if unit in ('g', 'ml', 'mg'):
+        step = next(step for bound, step in METRIC_STEPS if amount < bound)
+        return max(round(amount / step) * step, step)
+    if unit in ('kg', 'l'):
+        return max(round(amount * 20) / 20, 0.05)
+    if amount >= 10:
+        return round(amount * 2) / 2
+    whole = int(amount)
+    value = whole + _nearest_fraction(amount - whole)[0]
+    return round(value, 3) if value else 0.125
+
+
+def format_amount(amount: float) -> str:
+    """Amount as a cook would write it, e.g. "1 1/2" rather than 1.5"""
+    whole = int(amount)
+    fraction, text = _nearest_fraction(amount - whole)
+    if abs(amount - whole - fraction) > 0.01:
+        return f"{amount:g}"
+    whole += int(fraction)
+    if not text:
+        return str(whole)
+    return f"{whole} {text}" if whole else text
+
+
+def kitchen_unit(base_amount: float, dim: str, system: str = 'us') -> Tuple[float, str]:
+    """Readable unit and kitchen-rounded amount for a base amount
+
+    Starts from display_unit's choice and steps down the ladder while
+    rounding in the bigger unit would be off by more than KITCHEN_TOLERANCE.
+    """
+    amount, unit = display_unit(base_amount, dim, system)
+    ladder = [name for name, _ in DISPLAY_UNITS.get((dim, system), ())]
+    if unit not in ladder:
+        return kitchen_amount(amount, unit), unit
+    for candidate in reversed(ladder[:ladder.index(unit) + 1]):
+        value = base_amount / UNITS[candidate][1]
+        rounded = kitchen_amount(value, candidate)
+        if base_amount <= 0 or abs(rounded - value) <= KITCHEN_TOLERANCE * value:
+            return rounded, candidate
+    return rounded, candidate
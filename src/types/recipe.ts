@@ -40,6 +40,13 @@ export const CookingStepSchema = z.object({
   equipment_needed: z.array(z.string())
 });
 
+export const ThumbnailVariantSchema = z.object({
+  url: z.string(),
+  width: z.number(),
+  height: z.number(),
+  bytes: z.number()
+});
+
 export const RecipeSchema = z.object({
   title: z.string(),
   description: z.string(),
@@ -64,11 +71,16 @@ export const RecipeSchema = z.object({
   source_url: z.string().optional(),
   video_transcription: z.string().optional(),
   thumbnail_url: z.string().optional(),
-  created_at: z.string()
+  created_at: z.string(),
+  thumbnail_variants: z.record(
+    z.string(),
+    z.record(z.string(), ThumbnailVariantSchema)
+  ).optional()
 });
 
 export type MacroNutrients = z.infer<typeof MacroNutrientsSchema>;
 export type ShoppingItem = z.infer<typeof ShoppingItemSchema>;
 export type Ingredient = z.infer<typeof IngredientSchema>;
 export type CookingStep = z.infer<typeof CookingStepSchema>;
+export type ThumbnailVariant = z.infer<typeof ThumbnailVariantSchema>;
 export type Recipe = z.infer<typeof RecipeSchema>;
\ No newline at end of file
@@ -0,0 +1,3 @@
+-- Manifest of rendered thumbnail sizes and formats
+alter table public.recipes
+  add column thumbnail_variants jsonb;